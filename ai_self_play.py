@@ -2,17 +2,38 @@
 AI自对弈模块
 实现两个AI互相对弈的功能
 """
+import sys
 import time
-from chess_board import ChessBoard
+from concurrent.futures import ProcessPoolExecutor
+from chess_board import ChessBoard, square_name
 from game_manager import GameManager
 from chess_ai import ChessAI
-from chess_ai_gpu import ChessAIGPU
+
+
+# 子进程内复用的AI实例：(颜色, 深度) -> ChessAI，置换表和历史启发在同一进程的各次搜索间保留
+_worker_ais = {}
+
+
+def _search_root_move(board, color, max_depth, move, deadline):
+    """
+    子进程中搜索一个根节点移动（board是序列化传入的副本，deadline是整步搜索的截止时间）
+
+    Returns:
+        tuple: (各个完整搜索的深度的评分列表（AI视角）, 评估节点数)
+    """
+    ai = _worker_ais.get((color, max_depth))
+    if ai is None:
+        ai = _worker_ais[(color, max_depth)] = ChessAI(board, color=color, max_depth=max_depth, verbose=False)
+    ai.board = board
+    values = ai.search_root_move(move, deadline)
+    return values, ai.nodes_evaluated
 
 
 class AISelfPlay:
     """AI自对弈类"""
 
-    def __init__(self, white_depth=3, black_depth=3, display_board=True, delay=0.5, use_gpu=False):
+    def __init__(self, white_depth=3, black_depth=3, display_board=True, delay=0.5, use_gpu=False,
+                 benchmark=False, jobs=1):
         """
         初始化AI自对弈
 
@@ -22,22 +43,37 @@ class AISelfPlay:
             display_board: 是否显示棋盘
             delay: 每步之间的延迟（秒）
             use_gpu: 是否使用GPU加速
+            benchmark: 基准测试模式，不显示棋盘和每步信息，也不延迟
+            jobs: 搜索进程数，大于1时把根节点的各个移动分给多个进程并行搜索
         """
         self.game_manager = GameManager()
 
-        # 根据use_gpu选择AI类型
+        # 根据use_gpu选择AI类型；基准测试模式下AI也不打印每步的思考信息，计时不含控制台输出
+        verbose = not benchmark
         if use_gpu:
-            self.white_ai = ChessAIGPU(self.game_manager.board, color='white', max_depth=white_depth, use_gpu=True)
-            self.black_ai = ChessAIGPU(self.game_manager.board, color='black', max_depth=black_depth, use_gpu=True)
+            from chess_ai_gpu import ChessAIGPU
+            self.white_ai = ChessAIGPU(self.game_manager.board, color='white', max_depth=white_depth, use_gpu=True,
+                                       verbose=verbose)
+            self.black_ai = ChessAIGPU(self.game_manager.board, color='black', max_depth=black_depth, use_gpu=True,
+                                       verbose=verbose)
         else:
-            self.white_ai = ChessAI(self.game_manager.board, color='white', max_depth=white_depth)
-            self.black_ai = ChessAI(self.game_manager.board, color='black', max_depth=black_depth)
+            self.white_ai = ChessAI(self.game_manager.board, color='white', max_depth=white_depth, verbose=verbose)
+            self.black_ai = ChessAI(self.game_manager.board, color='black', max_depth=black_depth, verbose=verbose)
+
+        # 双方AI与游戏管理器走在同一个棋盘上，也共用它的验证器，合法移动缓存在双方的搜索之间共享
+        self.white_ai.validator = self.black_ai.validator = self.game_manager.validator
 
         self.display_board = display_board
         self.delay = delay
+        self.benchmark = benchmark
         self.move_count = 0
+        self.total_nodes = 0  # 双方AI累计评估节点数
         self.max_moves = 200  # 最大移动数限制，防止无限循环
 
+        # 根节点并行搜索的进程池，第一次需要时创建，对局结束后关闭
+        self.jobs = jobs
+        self._pool = None
+
     def play_game(self):
         """
         开始AI自对弈
@@ -50,61 +86,71 @@ class AISelfPlay:
         print(f"白方AI深度: {self.white_ai.max_depth}, 黑方AI深度: {self.black_ai.max_depth}")
         print("=" * 60)
 
-        if self.display_board:
+        if self.display_board and not self.benchmark:
             print("\n初始棋盘:")
             print(self.game_manager.board)
             print()
 
         start_time = time.time()
 
-        while not self.game_manager.game_over and self.move_count < self.max_moves:
-            self.move_count += 1
-            current_turn = self.game_manager.board.current_turn
-
-            print(f"\n--- 第 {self.move_count} 回合 ({current_turn}) ---")
-
-            # 选择当前AI
-            current_ai = self.white_ai if current_turn == 'white' else self.black_ai
-
-            # 更新AI的棋盘引用（确保AI使用最新的棋盘状态）
-            current_ai.board = self.game_manager.board
-
-            # 获取最佳移动
-            best_move = current_ai.get_best_move()
-
-            if best_move is None:
-                print(f"{current_turn} 无合法移动！")
-                break
-
-            from_pos, to_pos = best_move
-            from_row, from_col = from_pos
-            to_row, to_col = to_pos
-
-            # 获取棋子信息
-            piece = self.game_manager.board.get_piece(from_row, from_col)
-            move_notation = self._get_move_description(from_row, from_col, to_row, to_col, piece)
-
-            # 执行移动
-            success = self.game_manager.make_move(from_row, from_col, to_row, to_col)
-
-            if not success:
-                print(f"移动失败: {move_notation}")
-                break
-
-            print(f"{current_turn} 移动: {move_notation}")
-
-            # 显示棋盘
-            if self.display_board:
-                print(self.game_manager.board)
-
-            # 显示游戏状态
-            status = self.game_manager.get_game_status()
-            if status['is_check']:
-                print(f"[将军] {self.game_manager.board.current_turn} 被将军！")
-
-            # 延迟
-            if self.delay > 0:
-                time.sleep(self.delay)
+        # 进程池在对局结束、出错或被Ctrl-C中断时都要关闭，避免遗留子进程
+        try:
+            while not self.game_manager.game_over and self.move_count < self.max_moves:
+                self.move_count += 1
+                current_turn = self.game_manager.board.current_turn
+
+                if not self.benchmark:
+                    sys.stdout.write(f"\n--- 第 {self.move_count} 回合 ({current_turn}) ---\n")
+
+                # 选择当前AI
+                current_ai = self.white_ai if current_turn == 'white' else self.black_ai
+
+                # 更新AI的棋盘引用（确保AI使用最新的棋盘状态）
+                current_ai.board = self.game_manager.board
+
+                # 获取最佳移动
+                if self.jobs > 1:
+                    best_move = self._parallel_best_move(current_ai)
+                else:
+                    best_move = current_ai.get_best_move()
+
+                if best_move is None:
+                    print(f"{current_turn} 无合法移动！")
+                    break
+                self.total_nodes += current_ai.nodes_evaluated
+
+                from_pos, to_pos = best_move
+                from_row, from_col = from_pos
+                to_row, to_col = to_pos
+
+                # 获取棋子信息
+                piece = self.game_manager.board.get_piece(from_row, from_col)
+                move_notation = self._get_move_description(from_row, from_col, to_row, to_col, piece)
+
+                # 执行移动
+                success = self.game_manager.make_move(from_row, from_col, to_row, to_col)
+
+                if not success:
+                    print(f"移动失败: {move_notation}")
+                    break
+
+                if self.benchmark:
+                    continue
+
+                # 移动、棋盘和将军信息合并为一次输出
+                output = f"{current_turn} 移动: {move_notation}\n"
+                if self.display_board:
+                    output += f"{self.game_manager.board}\n"
+                status = self.game_manager.get_game_status()
+                if status['is_check']:
+                    output += f"[将军] {self.game_manager.board.current_turn} 被将军！\n"
+                sys.stdout.write(output)
+
+                # 延迟
+                if self.delay > 0:
+                    time.sleep(self.delay)
+        finally:
+            self._shutdown_pool()
 
         # 游戏结束
         end_time = time.time()
@@ -117,11 +163,69 @@ class AISelfPlay:
         result = self._get_game_result()
         result['total_moves'] = self.move_count
         result['duration'] = elapsed_time
+        result['nodes'] = self.total_nodes
 
         self._print_result(result)
 
         return result
 
+    def _shutdown_pool(self):
+        """关闭根节点并行搜索的进程池（未创建时什么也不做）"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _parallel_best_move(self, ai):
+        """
+        根节点并行搜索：每个合法移动作为独立的子问题交给进程池，各进程用完整窗口
+        迭代加深到ai.max_depth，取评分最高的移动（同分时取生成顺序靠前的）
+
+        各进程的置换表互不共享；ChessAIGPU的根节点批量评估只用于排序，这里不需要。
+        所有移动共用一个截止时间（从现在起ai.time_limit），整步搜索不会超过这个时限；
+        超时后各移动完成的深度可能不同，只比较所有移动都完成了的最深一层的评分
+        （一层都没完成的移动不参与比较）
+
+        Args:
+            ai: 当前行棋方的AI（提供颜色和搜索深度）
+
+        Returns:
+            tuple: ((from_row, from_col), (to_row, to_col)) 或 None
+        """
+        start_time = time.time()
+        board = self.game_manager.board
+        legal_moves = self.game_manager.validator.get_all_legal_moves(ai.color)
+        if not legal_moves:
+            return None
+
+        deadline = start_time + ai.time_limit
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.jobs)
+        futures = [self._pool.submit(_search_root_move, board, ai.color, ai.max_depth, move, deadline)
+                   for move in legal_moves]
+        try:
+            results = [future.result() for future in futures]
+        except BaseException:
+            # 出错或被中断时取消尚未开始的任务，正在进行的任务最迟在截止时间结束
+            for future in futures:
+                future.cancel()
+            raise
+
+        ai.nodes_evaluated = sum(nodes for _, nodes in results)
+        finished = [i for i in range(len(legal_moves)) if results[i][0]]
+        if not finished:
+            return legal_moves[0]
+
+        # values[d]是子局面搜索深度d（根节点深度d + 1）的评分
+        depth = min(len(results[i][0]) for i in finished)
+        best_index = max(finished, key=lambda i: results[i][0][depth - 1])
+
+        if ai.verbose:
+            elapsed_time = time.time() - start_time
+            print(f"AI思考时间: {elapsed_time:.2f}秒, 评估节点数: {ai.nodes_evaluated}, "
+                  f"深度: {depth}（{self.jobs}进程根节点并行）")
+
+        return legal_moves[best_index]
+
     def _get_move_description(self, from_row, from_col, to_row, to_col, piece):
         """获取移动描述"""
         piece_names = {
@@ -133,8 +237,8 @@ class AISelfPlay:
             'K': '王', 'k': '王'
         }
 
-        from_notation = chr(ord('a') + from_col) + str(8 - from_row)
-        to_notation = chr(ord('a') + to_col) + str(8 - to_row)
+        from_notation = square_name(from_row, from_col)
+        to_notation = square_name(to_row, to_col)
         piece_name = piece_names.get(piece, piece)
 
         target = self.game_manager.board.get_piece(to_row, to_col)
@@ -158,15 +262,8 @@ class AISelfPlay:
         return result
 
     def _count_pieces(self, color):
-        """统计指定颜色的棋子数量"""
-        count = 0
-        for row in range(8):
-            for col in range(8):
-                piece = self.game_manager.board.get_piece(row, col)
-                if piece != self.game_manager.board.EMPTY:
-                    if self.game_manager.board.get_piece_color(piece) == color:
-                        count += 1
-        return count
+        """统计指定颜色的棋子数量（直接取棋盘增量维护的该方棋子格子集合的大小）"""
+        return len(self.game_manager.board.piece_squares[color])
 
     def _print_result(self, result):
         """打印游戏结果"""
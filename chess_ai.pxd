@@ -0,0 +1,44 @@
+# Cython增强声明文件：为chess_ai.py提供静态类型，源码保持纯Python
+# 编译：pip install cython && cythonize -i chess_ai.py
+# 编译生成的扩展模块会优先于chess_ai.py被导入；未编译时照常使用纯Python版本
+cimport cython
+
+
+cdef class ChessAI:
+    cdef public object board
+    cdef public str color
+    cdef public int max_depth
+    cdef public bint verbose
+    cdef public long nodes_evaluated
+    cdef public double time_limit
+    cdef public double start_time
+    cdef public object validator
+    cdef public long _time_check_mask
+    cdef public bint _timed_out
+    cdef public bint _in_null_move
+    cdef public object tt
+    cdef public list killers
+    cdef public object history
+
+    @cython.locals(slot=Py_ssize_t, original_alpha=int)
+    cpdef _negamax(self, board, int depth, int alpha, int beta)
+
+    @cython.locals(best_value=int, value=int)
+    cpdef _negamax_search(self, board, int depth, int alpha, int beta, tt_move=*)
+
+    @cython.locals(stand_pat=int, best_value=int, value=int)
+    cpdef _quiesce(self, board, int alpha, int beta)
+
+    @cython.locals(center=int, extended=int, score=int)
+    cpdef _evaluate_center_control(self, board)
+
+    @cython.locals(ai_pawn=int, opponent_pawn=int, score=int, square=int, code=int,
+                   row=int, col=int, protect_row=int, protect_square=int, protect_col=int, offset=int)
+    cpdef _evaluate_pawn_structure(self, board)
+
+    @cython.locals(from_row=int, from_col=int, to_row=int, to_col=int, from_square=int, to_square=int,
+                   piece=int, captured=int, arrived=int, rook=int, en_passant_square=int,
+                   material_score=long, psqt_score=long)
+    cpdef _make_move(self, board, move)
+
+    cpdef _undo_move(self, board, move, undo)
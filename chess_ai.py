@@ -3,7 +3,59 @@
 实现Minimax算法配合Alpha-Beta剪枝
 """
 import time
+from array import array
+from collections import defaultdict
+import numpy as np
+from chess_board import ChessBoard, popcount
 from move_validator import MoveValidator
+from movegen_tables import CENTER_SQUARES, EXTENDED_CENTER_SQUARES, square_mask
+from chess_ai_numba import NUMBA_AVAILABLE, build_code_tables
+
+if NUMBA_AVAILABLE:
+    from chess_ai_numba import evaluate_int8, evaluate_structure_int8
+
+
+def _flatten_table(table):
+    """将8x8位置价值表展开为按 row * 8 + col 索引的64元组"""
+    return tuple(value for row in table for value in row)
+
+
+def _build_eval_tables(psqt_flat, piece_values):
+    """
+    构建增量评估用的有符号查找表（白方为正、黑方为负）
+
+    Args:
+        psqt_flat: 棋子字符 -> 64格位置价值（黑方已上下翻转）
+        piece_values: 棋子类型 -> 子力价值
+
+    Returns:
+        tuple: (material, psqt)，material[piece]为子力价值，
+               psqt[piece][row * 8 + col]为位置价值
+    """
+    material = {}
+    psqt = {}
+    for piece, table in psqt_flat.items():
+        sign = 1 if piece.isupper() else -1
+        material[piece] = sign * piece_values[piece.upper()]
+        psqt[piece] = tuple(sign * value for value in table)
+    return material, psqt
+
+
+def _build_mvv_lva(code_material):
+    """
+    构建吃子排序分数表（MVV-LVA：先吃高价值子、用低价值子吃）
+
+    Args:
+        code_material: 按编码索引的子力价值（CODE_MATERIAL，白方编码1-6为正值）
+
+    Returns:
+        tuple: 按 victim_type * 8 + attacker_type 索引（类型为编码的绝对值1-6）
+    """
+    table = [0] * 56
+    for victim in range(1, 7):
+        for attacker in range(1, 7):
+            table[victim * 8 + attacker] = 10 ** 6 + 10 * code_material[victim] - code_material[attacker]
+    return tuple(table)
 
 
 class ChessAI:
@@ -82,7 +134,68 @@ class ChessAI:
         [20, 30, 10,  0,  0, 10, 30, 20]
     ]
 
-    def __init__(self, board, color='black', max_depth=6):
+    # 展开后的位置价值表：棋子字符 -> 64元组，黑方使用上下翻转的表
+    PSQT_FLAT = {
+        'P': _flatten_table(PAWN_TABLE), 'p': _flatten_table(PAWN_TABLE[::-1]),
+        'N': _flatten_table(KNIGHT_TABLE), 'n': _flatten_table(KNIGHT_TABLE[::-1]),
+        'B': _flatten_table(BISHOP_TABLE), 'b': _flatten_table(BISHOP_TABLE[::-1]),
+        'R': _flatten_table(ROOK_TABLE), 'r': _flatten_table(ROOK_TABLE[::-1]),
+        'Q': _flatten_table(QUEEN_TABLE), 'q': _flatten_table(QUEEN_TABLE[::-1]),
+        'K': _flatten_table(KING_TABLE), 'k': _flatten_table(KING_TABLE[::-1]),
+    }
+
+    # 增量评估查找表（白方视角）
+    MATERIAL, PSQT = _build_eval_tables(PSQT_FLAT, ChessBoard.PIECE_VALUES)
+
+    # 按整数编码索引的同一套表，供Numba内核在ChessBoard.squares上使用
+    MATERIAL_BY_CODE, PSQT_BY_CODE = build_code_tables(MATERIAL, PSQT, ChessBoard.PIECE_CODES)
+    SQUARE_INDEX = np.arange(64)
+
+    # 同一套表展开为Python元组，供_make_move增量更新时直接用棋盘上的编码取值：
+    # CODE_MATERIAL[code]，CODE_PSQT[code * 64 + square]（黑方负编码经负下标回绕到对应行，空格为0）
+    CODE_MATERIAL = tuple(MATERIAL_BY_CODE.tolist())
+    CODE_PSQT = tuple(PSQT_BY_CODE.ravel().tolist())
+
+    # 吃子排序分数：MVV_LVA[victim_type * 8 + attacker_type]
+    MVV_LVA = _build_mvv_lva(CODE_MATERIAL)
+
+    # 中心和扩展中心（格子定义见movegen_tables，Numba评估内核也使用）的位棋盘掩码（第square位为1）
+    CENTER_MASK = square_mask(CENTER_SQUARES)
+    EXTENDED_CENTER_MASK = square_mask(EXTENDED_CENTER_SQUARES)
+
+    # 被将死的评分（行棋方视角为-MATE_SCORE），同时作为搜索窗口的边界；所有评分均为整数
+    MATE_SCORE = (1 << 16) - 1
+
+    # 置换表条目类型：精确值、下界（fail-high）、上界（fail-low）
+    TT_EXACT = 0
+    TT_LOWER = 1
+    TT_UPPER = 2
+
+    # 固定大小的置换表：每个槽位两个64位字（Zobrist键、打包后的条目），冲突时直接覆盖
+    TT_SIZE = 1 << 18
+    TT_MASK = TT_SIZE - 1
+
+    # 条目打包格式：value + TT_VALUE_OFFSET (17位) | depth (6位) | flag (2位) | move (13位)
+    # move = from_sq | to_sq << 6 | 1 << 12（最高位表示有最佳移动）；±MATE_SCORE恰好在17位范围内
+    TT_VALUE_OFFSET = 1 << 16
+
+    # depth字段能表示的最大深度；更深的条目按此深度存放（只会被当作较浅的结果，不影响正确性）
+    TT_MAX_DEPTH = 63
+
+    # 静态搜索Delta剪枝的安全余量
+    DELTA_MARGIN = 200
+
+    # 历史启发分数上限，保证安静移动始终排在杀手移动（800000起）和吃子之后
+    HISTORY_LIMIT = 100000
+
+    # 迭代加深中渴望窗口的半宽
+    ASPIRATION_WINDOW = 50
+
+    # 空着裁剪：剩余深度不小于NULL_MOVE_MIN_DEPTH时尝试，空着后的搜索深度额外减少R
+    NULL_MOVE_MIN_DEPTH = 3
+    NULL_MOVE_REDUCTION = 2
+
+    def __init__(self, board, color='black', max_depth=6, verbose=True):
         """
         初始化AI
 
@@ -90,52 +203,150 @@ class ChessAI:
             board: ChessBoard实例
             color: AI执棋颜色（'white' 或 'black'）
             max_depth: 最大搜索深度
+            verbose: 是否打印每步的思考时间、超时等信息
         """
         self.board = board
         self.color = color
         self.max_depth = max_depth
+        self.verbose = verbose
         self.nodes_evaluated = 0
         self.time_limit = 30.0  # 每步最大思考时间（秒）
         self.start_time = 0
 
+        # 搜索中原地执行/撤销移动，整个搜索共用一个验证器（在get_best_move中随self.board更新）
+        self.validator = MoveValidator(board)
+
+        # 每搜索 (掩码 + 1) 个节点才读取一次时间；一旦超时即置位，之后各处只检查该标志
+        self._time_check_mask = 0x3FF
+        self._timed_out = False
+
+        # 正在空着之后的子树中搜索（不再连续空着）
+        self._in_null_move = False
+
+        # 置换表：槽位 (key & TT_MASK) * 2 存放Zobrist键，下一个字存放打包的
+        # (depth, flag, value, best_move)，值以该局面行棋方视角计分
+        self.tt = array('Q', bytes(8 * 2 * self.TT_SIZE))
+
+        # 杀手移动（每层两个）和历史启发表，用于安静移动排序
+        self.killers = [[None, None] for _ in range(max_depth + 1)]
+        self.history = defaultdict(lambda: [0] * 64)
+
     def get_best_move(self):
         """
-        获取最佳移动
+        获取最佳移动（迭代加深：从深度1逐层搜索到max_depth）
 
         Returns:
             tuple: ((from_row, from_col), (to_row, to_col)) 或 None
         """
         self.nodes_evaluated = 0
         self.start_time = time.time()
+        self._timed_out = False
 
-        validator = MoveValidator(self.board)
-        legal_moves = validator.get_all_legal_moves(self.color)
+        # 调用方可能替换了self.board（如自对弈中），验证器需指向当前棋盘
+        if self.validator.board is not self.board:
+            self.validator = MoveValidator(self.board)
+        legal_moves = self.validator.get_all_legal_moves(self.color)
 
         if not legal_moves:
             return None
 
+        # 对局中的走子不维护增量评估值，搜索开始前从头计算一次
+        self.board.material_score, self.board.psqt_score = self._evaluate_material(self.board)
+
+        # 同一个AI会下完整盘棋：每步开始时把历史启发分数减半，旧局面的统计逐渐淡出
+        for table in self.history.values():
+            for square in range(64):
+                table[square] >>= 1
+
         best_move = None
-        best_value = float('-inf')
-        alpha = float('-inf')
-        beta = float('inf')
+        values = {}  # 深度 -> 该层完整搜索的根节点评分
+        completed_depth = 0
+
+        # 每一层的最佳移动作为下一层第一个搜索的移动；只采用完整搜索完的层的结果
+        for depth in range(1, self.max_depth + 1):
+            # 渴望窗口：评估含行棋方的移动自由度，评分随深度奇偶摆动，因此以两层前
+            # （同一奇偶）的评分为中心用窄窗口搜索，落在窗口外时再用完整窗口重搜
+            alpha, beta = -self.MATE_SCORE, self.MATE_SCORE
+            if depth - 2 in values:
+                alpha = max(values[depth - 2] - self.ASPIRATION_WINDOW, -self.MATE_SCORE)
+                beta = min(values[depth - 2] + self.ASPIRATION_WINDOW, self.MATE_SCORE)
+            move, value, completed = self._search_root(depth, alpha, beta, best_move)
+            if completed and not alpha < value < beta and depth - 2 in values:
+                alpha, beta = -self.MATE_SCORE, self.MATE_SCORE
+                move, value, completed = self._search_root(depth, alpha, beta, best_move)
+
+            if not completed:
+                # 上一层最佳移动总是最先搜索，超时前已搜完的移动中选出的最佳移动不会比它差；
+                # 窄窗口下评分不高于alpha的移动只是上界，不能据此换掉上一层的结果
+                if move is not None and value > alpha:
+                    best_move = move
+                if self.verbose:
+                    print(f"AI搜索超时，已评估 {self.nodes_evaluated} 节点")
+                break
+
+            best_move = move
+            values[depth] = value
+            completed_depth = depth
 
-        # 对每个合法移动进行评估
-        for move in legal_moves:
-            # 检查是否超时
             if time.time() - self.start_time > self.time_limit:
-                print(f"AI搜索超时，已评估 {self.nodes_evaluated} 节点")
                 break
 
-            from_pos, to_pos = move
-            from_row, from_col = from_pos
-            to_row, to_col = to_pos
+        # 降级处理：如果所有移动都是-MATE_SCORE（例如必输局面）或第一层就已超时，选择第一个合法移动
+        if best_move is None:
+            best_move = legal_moves[0]
+            if self.verbose:
+                print("警告: 没有完成搜索或所有移动评分均为-MATE_SCORE，选择第一个合法移动作为降级方案")
 
-            # 创建临时棋盘并执行移动
-            temp_board = self.board.copy()
-            self._execute_move(temp_board, from_row, from_col, to_row, to_col)
+        if self.verbose:
+            elapsed_time = time.time() - self.start_time
+            print(f"AI思考时间: {elapsed_time:.2f}秒, 评估节点数: {self.nodes_evaluated}, 深度: {completed_depth}")
 
-            # 使用Minimax评估
-            value = self._minimax(temp_board, self.max_depth - 1, alpha, beta, False)
+        return best_move
+
+    def _search_root(self, depth, alpha, beta, prev_best=None):
+        """
+        以固定深度搜索根节点（主变例搜索PVS）
+
+        第一个移动用完整窗口搜索；其余移动先用零窗口 (alpha, alpha + 1) 验证能否超过当前最佳值，
+        只有零窗口搜索失败高（fail high）时才用完整窗口重新搜索
+
+        Args:
+            depth: 搜索深度
+            alpha: Alpha值
+            beta: Beta值
+            prev_best: 上一层迭代的最佳移动，优先搜索
+
+        Returns:
+            tuple: (最佳移动, 最佳评分, 是否在时限内完整搜索)
+        """
+        legal_moves = self.validator.get_all_legal_moves(self.color)
+        legal_moves = self._order_root_moves(legal_moves, depth, prev_best)
+
+        best_move = None
+        best_value = -self.MATE_SCORE
+        is_first = True
+
+        # 对每个合法移动进行评估
+        for move in legal_moves:
+            # 检查是否超时（根节点每个移动都读取一次时间）
+            if self._timed_out or time.time() - self.start_time > self.time_limit:
+                self._timed_out = True
+                return best_move, best_value, False
+
+            # 在棋盘上原地执行移动，评估后撤销
+            undo = self._make_move(self.board, move)
+            if is_first:
+                value = -self._negamax(self.board, depth - 1, -beta, -alpha)
+                is_first = False
+            else:
+                value = -self._negamax(self.board, depth - 1, -alpha - 1, -alpha)
+                if alpha < value < beta:
+                    value = -self._negamax(self.board, depth - 1, -beta, -alpha)
+            self._undo_move(self.board, move, undo)
+
+            # 超时中断的子树评分不可靠，只保留之前已完整搜索的移动
+            if self._timed_out:
+                return best_move, best_value, False
 
             # 更新最佳移动
             if value > best_value:
@@ -144,361 +355,539 @@ class ChessAI:
 
             alpha = max(alpha, value)
 
-        # 降级处理：如果所有移动都是-inf（例如必输局面），选择第一个合法移动
-        if best_move is None and legal_moves:
-            best_move = legal_moves[0]
-            best_value = float('-inf')
-            print("警告: 所有移动评分均为-inf，选择第一个合法移动作为降级方案")
+        return best_move, best_value, True
+
+    def search_root_move(self, move, deadline=None):
+        """
+        用完整窗口单独搜索一个根节点移动（供根节点并行搜索的各个进程调用）
 
-        elapsed_time = time.time() - self.start_time
-        print(f"AI思考时间: {elapsed_time:.2f}秒, 评估节点数: {self.nodes_evaluated}, 深度: {self.max_depth}")
+        执行移动后对子局面从深度0迭代加深到max_depth - 1，超时则停止，只返回完整搜索的各层
 
-        return best_move
+        Args:
+            move: 根节点的合法移动
+            deadline: 整步搜索的截止时间（time.time()时刻），各进程共用；为None时从现在起计time_limit
 
-    def _minimax(self, board, depth, alpha, beta, is_maximizing):
+        Returns:
+            list: 各个完整搜索的深度的评分（AI视角），下标为子局面的搜索深度
         """
-        Minimax算法配合Alpha-Beta剪枝
+        self.nodes_evaluated = 0
+        # 超时检查都以 start_time + time_limit 为界，共用截止时间时反推出start_time
+        self.start_time = time.time() if deadline is None else deadline - self.time_limit
+        self._timed_out = False
+
+        if self.validator.board is not self.board:
+            self.validator = MoveValidator(self.board)
+        self.board.material_score, self.board.psqt_score = self._evaluate_material(self.board)
+
+        undo = self._make_move(self.board, move)
+        values = []
+        for depth in range(self.max_depth):
+            value = -self._negamax(self.board, depth, -self.MATE_SCORE, self.MATE_SCORE)
+            if self._timed_out:
+                break
+            values.append(value)
+            if time.time() - self.start_time > self.time_limit:
+                break
+        self._undo_move(self.board, move, undo)
+
+        return values
+
+    def _order_root_moves(self, moves, depth, prev_best=None):
+        """根节点移动排序（子类可覆盖），默认与内部节点相同"""
+        return self._order_moves(self.board, moves, depth, prev_best)
+
+    def _negamax(self, board, depth, alpha, beta):
+        """
+        Negamax形式的Alpha-Beta搜索
+
+        评估值始终以当前行棋方视角计分，子节点的值取负即为父节点视角，
+        因此双方共用同一套搜索代码
 
         Args:
             board: 当前棋盘状态
             depth: 剩余搜索深度
             alpha: Alpha值
             beta: Beta值
-            is_maximizing: 是否是最大化玩家
 
         Returns:
-            float: 评估值
+            int: 评估值（行棋方视角）
         """
         self.nodes_evaluated += 1
 
         # 检查超时
-        if time.time() - self.start_time > self.time_limit:
-            return self._evaluate_board(board)
+        if ((self.nodes_evaluated & self._time_check_mask) == 0 and
+                time.time() - self.start_time > self.time_limit):
+            self._timed_out = True
+        if self._timed_out:
+            return self._evaluate_relative(board)
+
+        # 探测置换表：在构造验证器和将死检测之前完成，命中时直接返回
+        original_alpha = alpha
+        key = board.zobrist_key()
+        slot = (key & self.TT_MASK) << 1
+        tt_move = None
+        if self.tt[slot] == key:
+            entry_depth, flag, value, tt_move = self._tt_unpack(self.tt[slot + 1])
+            if entry_depth >= depth:
+                if flag == self.TT_EXACT:
+                    return value
+                if flag == self.TT_LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if beta <= alpha:
+                    return value
 
-        # 达到最大深度或游戏结束
-        if depth == 0:
-            return self._evaluate_board(board)
+        value, best_move = self._negamax_search(board, depth, alpha, beta, tt_move)
 
-        validator = MoveValidator(board)
-        current_color = self.color if is_maximizing else self._opposite_color(self.color)
+        # 超时后的结果不完整，不写入置换表
+        if not self._timed_out:
+            if value <= original_alpha:
+                flag = self.TT_UPPER
+            elif value >= beta:
+                flag = self.TT_LOWER
+            else:
+                flag = self.TT_EXACT
+            self.tt[slot] = key
+            self.tt[slot + 1] = self._tt_pack(depth, flag, value, best_move)
+
+        return value
+
+    def _tt_pack(self, depth, flag, value, best_move):
+        """将置换表条目打包为一个64位整数"""
+        packed = (value + self.TT_VALUE_OFFSET) | (min(depth, self.TT_MAX_DEPTH) << 17) | (flag << 23)
+        if best_move is not None:
+            (from_row, from_col), (to_row, to_col) = best_move
+            move = (from_row * 8 + from_col) | ((to_row * 8 + to_col) << 6) | (1 << 12)
+            packed |= move << 25
+        return packed
+
+    def _tt_unpack(self, packed):
+        """
+        解包置换表条目
 
-        # 检查游戏是否结束
-        if validator.is_checkmate(current_color):
-            return float('-inf') if is_maximizing else float('inf')
-        if validator.is_stalemate(current_color):
-            return 0
+        Returns:
+            tuple: (depth, flag, value, best_move)
+        """
+        value = (packed & 0x1FFFF) - self.TT_VALUE_OFFSET
+
+        best_move = None
+        move = packed >> 25
+        if move:
+            from_sq = move & 0x3F
+            to_sq = (move >> 6) & 0x3F
+            best_move = ((from_sq >> 3, from_sq & 7), (to_sq >> 3, to_sq & 7))
+
+        return (packed >> 17) & 0x3F, (packed >> 23) & 0x3, value, best_move
 
+    def _negamax_search(self, board, depth, alpha, beta, tt_move=None):
+        """
+        Negamax搜索主体（置换表未命中时调用）
+
+        Args:
+            board: 当前棋盘状态
+            depth: 剩余搜索深度
+            alpha: Alpha值
+            beta: Beta值
+            tt_move: 置换表中记录的最佳移动，优先搜索
+
+        Returns:
+            tuple: (评估值, 最佳移动)
+        """
+        # 达到最大深度后进入静态搜索，直到局面中没有可吃的子
+        if depth == 0:
+            return self._quiesce(board, alpha, beta), None
+
+        validator = self.validator
+        current_color = board.current_turn
+
+        # 只生成一次合法移动：无子可动时被将军为将死，否则为僵局
         legal_moves = validator.get_all_legal_moves(current_color)
         if not legal_moves:
-            return 0
+            if validator.is_in_check(current_color):
+                return -self.MATE_SCORE, None
+            return 0, None
+
+        # 空着裁剪：放弃一步让对方连走，浅搜后仍不低于beta则本局面几乎必然fail high
+        if (depth >= self.NULL_MOVE_MIN_DEPTH and beta - alpha == 1 and
+                self._can_null_move(board, validator, current_color)):
+            value = self._null_move_search(board, depth, beta)
+            if value >= beta:
+                return beta, None
+
+        legal_moves = self._order_moves(board, legal_moves, depth, tt_move)
+        best_move = None
+        best_value = -self.MATE_SCORE
 
-        if is_maximizing:
-            max_eval = float('-inf')
-            for move in legal_moves:
-                # 超时检测
-                if time.time() - self.start_time > self.time_limit:
-                    # 如果还没评估任何移动，返回静态评估而不是-inf
-                    if max_eval == float('-inf'):
-                        return self._evaluate_board(board)
-                    return max_eval
+        for move in legal_moves:
+            # 超时检测
+            if self._timed_out:
+                # 如果还没评估任何移动，返回静态评估而不是-MATE_SCORE
+                if best_move is None:
+                    return self._evaluate_relative(board), None
+                return best_value, best_move
+
+            # 主变例搜索：第一个移动用完整窗口，其余先用零窗口验证，fail high时再完整重搜
+            undo = self._make_move(board, move)
+            if best_move is None or beta - alpha == 1:
+                value = -self._negamax(board, depth - 1, -beta, -alpha)
+            else:
+                value = -self._negamax(board, depth - 1, -alpha - 1, -alpha)
+                if alpha < value < beta:
+                    value = -self._negamax(board, depth - 1, -beta, -value)
+            self._undo_move(board, move, undo)
+            if value > best_value or best_move is None:
+                best_value = value
+                best_move = move
 
-                from_pos, to_pos = move
-                from_row, from_col = from_pos
-                to_row, to_col = to_pos
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                self._record_cutoff(move, undo, depth)
+                break  # Beta剪枝
 
-                temp_board = board.copy()
-                self._execute_move(temp_board, from_row, from_col, to_row, to_col)
+        return best_value, best_move
 
-                eval_value = self._minimax(temp_board, depth - 1, alpha, beta, False)
-                max_eval = max(max_eval, eval_value)
+    def _can_null_move(self, board, validator, color):
+        """
+        判断能否尝试空着：不在空着子树中、未被将军，且行棋方还有兵以外的子力
+        （只剩王和兵时容易出现“不走棋最好”的局面，空着假设不成立）
+        """
+        if self._in_null_move:
+            return False
+        sign = 1 if color == 'white' else -1
+        bitboards = board.bitboards
+        if not (bitboards[2 * sign] or bitboards[3 * sign] or
+                bitboards[4 * sign] or bitboards[5 * sign]):
+            return False
+        return not validator.is_in_check(color)
+
+    def _null_move_search(self, board, depth, beta):
+        """
+        执行空着（只交换行棋方并清除过路兵目标），以零窗口 (beta - 1, beta) 做减深度搜索
 
-                alpha = max(alpha, eval_value)
-                if beta <= alpha:
-                    break  # Beta剪枝
+        Returns:
+            int: 空着后的评估值（原行棋方视角）
+        """
+        en_passant_target = board.en_passant_target
+        board.en_passant_target = None
+        board.switch_turn()
+        self._in_null_move = True
 
-            return max_eval
-        else:
-            min_eval = float('inf')
-            for move in legal_moves:
-                # 超时检测
-                if time.time() - self.start_time > self.time_limit:
-                    # 如果还没评估任何移动，返回静态评估而不是+inf
-                    if min_eval == float('inf'):
-                        return self._evaluate_board(board)
-                    return min_eval
-
-                from_pos, to_pos = move
-                from_row, from_col = from_pos
-                to_row, to_col = to_pos
-
-                temp_board = board.copy()
-                self._execute_move(temp_board, from_row, from_col, to_row, to_col)
-
-                eval_value = self._minimax(temp_board, depth - 1, alpha, beta, True)
-                min_eval = min(min_eval, eval_value)
-
-                beta = min(beta, eval_value)
-                if beta <= alpha:
-                    break  # Alpha剪枝
+        value = -self._negamax(board, depth - 1 - self.NULL_MOVE_REDUCTION, -beta, -beta + 1)
 
-            return min_eval
+        self._in_null_move = False
+        board.switch_turn()
+        board.en_passant_target = en_passant_target
+        return value
 
-    def _evaluate_board(self, board):
+    def _quiesce(self, board, alpha, beta):
         """
-        评估棋盘局面
+        静态搜索：只搜索吃子，直到局面平静，避免在交换中途停止评估（水平线效应）
+
+        不搜索将军和应将的非吃子移动；但没有合法移动时按将死/僵局计分，不当作平静局面
+
+        Args:
+            board: 当前棋盘状态
+            alpha: Alpha值
+            beta: Beta值
 
         Returns:
-            float: 评估值（正值对AI有利，负值对对手有利）
+            int: 评估值（行棋方视角）
         """
-        score = 0
+        self.nodes_evaluated += 1
 
-        # 遍历棋盘上的所有棋子
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece == board.EMPTY:
-                    continue
+        validator = self.validator
+        legal_moves = validator.get_all_legal_moves(board.current_turn)
+        if not legal_moves:
+            if validator.is_in_check(board.current_turn):
+                return -self.MATE_SCORE
+            return 0
 
-                piece_type = piece.upper()
-                is_white = board.is_white_piece(piece)
-                piece_color = 'white' if is_white else 'black'
+        # 不吃子（stand pat）时的静态评估作为下限，复用已生成的合法移动
+        stand_pat = self._evaluate_relative(board, validator, len(legal_moves))
+        if ((self.nodes_evaluated & self._time_check_mask) == 0 and
+                time.time() - self.start_time > self.time_limit):
+            self._timed_out = True
+        if self._timed_out:
+            return stand_pat
+
+        if stand_pat >= beta:
+            return stand_pat
+        # 即使吃掉后也追不上alpha时不必逐个检查吃子
+        if stand_pat + board.PIECE_VALUES[board.QUEEN] + self.DELTA_MARGIN < alpha:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        squares = board.squares
+        captures = [move for move in legal_moves if squares[move[1][0] * 8 + move[1][1]]]
+        captures = self._order_moves(board, captures, 0)
+
+        code_material = self.CODE_MATERIAL
+        best_value = stand_pat
+        for move in captures:
+            # Delta剪枝：即使白吃该子并再获得安全余量也无法超过alpha，则跳过
+            victim_value = abs(code_material[squares[move[1][0] * 8 + move[1][1]]])
+            if stand_pat + victim_value + self.DELTA_MARGIN < alpha:
+                continue
+
+            undo = self._make_move(board, move)
+            value = -self._quiesce(board, -beta, -alpha)
+            self._undo_move(board, move, undo)
+
+            best_value = max(best_value, value)
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
 
-                # 基础材料价值
-                piece_value = board.PIECE_VALUES.get(piece_type, 0)
+        return best_value
 
-                # 位置价值
-                position_value = self._get_position_value(piece_type, row, col, is_white)
+    def _order_moves(self, board, moves, depth, tt_move=None):
+        """
+        对移动排序以提高Alpha-Beta剪枝效率
 
-                total_value = piece_value + position_value
+        顺序：置换表最佳移动 > 吃子（MVV-LVA：先吃高价值子、用低价值子吃）
+        > 杀手移动 > 按历史启发分数排序的安静移动
 
-                # 根据颜色决定加减
-                if piece_color == self.color:
-                    score += total_value
-                else:
-                    score -= total_value
+        Args:
+            board: 当前棋盘状态
+            moves: 合法移动列表
+            depth: 剩余搜索深度（杀手移动按深度分层记录）
+            tt_move: 置换表中记录的最佳移动
 
-        # 添加其他评估因素
-        score += self._evaluate_mobility(board)
-        score += self._evaluate_king_safety(board)
-        score += self._evaluate_center_control(board)
-        score += self._evaluate_pawn_structure(board)
+        Returns:
+            list: 排序后的移动列表
+        """
+        # 直接读取int8棋盘编码：吃子查MVV_LVA表，安静移动的历史启发仍按棋子字符记录
+        squares = board.squares
+        piece_chars = board.PIECE_CHARS
+        mvv_lva = self.MVV_LVA
+        history = self.history
+        killers = self.killers[depth] if depth < len(self.killers) else (None, None)
+
+        def score(move):
+            if move == tt_move:
+                return 10 ** 7
+            (from_row, from_col), (to_row, to_col) = move
+            to_square = to_row * 8 + to_col
+            code = squares[from_row * 8 + from_col]
+            victim = squares[to_square]
+            if victim:
+                return mvv_lva[(victim if victim > 0 else -victim) * 8 + (code if code > 0 else -code)]
+            if move == killers[0]:
+                return 900000
+            if move == killers[1]:
+                return 800000
+            return history[piece_chars[code]][to_square]
+
+        return sorted(moves, key=score, reverse=True)
+
+    def _record_cutoff(self, move, undo, depth):
+        """
+        记录引起剪枝的安静移动（杀手移动和历史启发）
 
-        return score
+        Args:
+            move: 引起剪枝的移动
+            undo: 该移动的撤销信息（用于判断是否吃子）
+            depth: 剩余搜索深度
+        """
+        piece, captured, en_passant_captured = undo[0], undo[1], undo[2]
+        if captured != self.board.EMPTY or en_passant_captured is not None:
+            return
+
+        if depth < len(self.killers):
+            killers = self.killers[depth]
+            if move != killers[0]:
+                killers[1] = killers[0]
+                killers[0] = move
+
+        to_row, to_col = move[1]
+        table = self.history[piece]
+        to_square = to_row * 8 + to_col
+        table[to_square] = min(table[to_square] + depth * depth, self.HISTORY_LIMIT)
+
+    def _evaluate_board(self, board, validator=None, move_count=None):
+        """
+        评估棋盘局面
 
-    def _get_position_value(self, piece_type, row, col, is_white):
-        """获取棋子的位置价值"""
-        # 黑方需要翻转棋盘
-        eval_row = row if is_white else 7 - row
-
-        if piece_type == 'P':
-            return self.PAWN_TABLE[eval_row][col]
-        elif piece_type == 'N':
-            return self.KNIGHT_TABLE[eval_row][col]
-        elif piece_type == 'B':
-            return self.BISHOP_TABLE[eval_row][col]
-        elif piece_type == 'R':
-            return self.ROOK_TABLE[eval_row][col]
-        elif piece_type == 'Q':
-            return self.QUEEN_TABLE[eval_row][col]
-        elif piece_type == 'K':
-            return self.KING_TABLE[eval_row][col]
-
-        return 0
-
-    def _evaluate_mobility(self, board):
-        """评估移动自由度"""
-        validator = MoveValidator(board)
-
-        ai_moves = len(validator.get_all_legal_moves(self.color))
-        opponent_moves = len(validator.get_all_legal_moves(self._opposite_color(self.color)))
-
-        return (ai_moves - opponent_moves) * 10
-
-    def _evaluate_king_safety(self, board):
-        """评估王的安全性"""
-        validator = MoveValidator(board)
-        score = 0
+        Args:
+            board: 当前棋盘状态
+            validator: 调用方已创建的MoveValidator（可选）
+            move_count: 调用方已生成的行棋方合法移动数（可选）
 
-        # 检查AI的王是否被将军
-        if validator.is_in_check(self.color):
-            score -= 50
+        Returns:
+            int: 评估值（正值对AI有利，负值对对手有利）
+        """
+        # 子力和位置价值由_make_move/_undo_move增量维护（白方视角）
+        score = board.material_score + board.psqt_score
+        if self.color == 'black':
+            score = -score
+
+        if validator is None:
+            validator = self.validator if self.validator.board is board else MoveValidator(board)
+
+        # 移动自由度和王的安全性只需计算行棋方：MoveValidator只为行棋方生成走法
+        # （非行棋方的移动数恒为0），而合法局面中非行棋方的王不可能被将军
+        side_to_move = board.current_turn
+        if move_count is None:
+            move_count = len(validator.get_all_legal_moves(side_to_move))
+        side_score = move_count * 10
+        if validator.is_in_check(side_to_move):
+            side_score -= 50  # 被将军扣分
+        if side_to_move == self.color:
+            score += side_score
+        else:
+            score -= side_score
 
-        # 检查对手的王是否被将军
-        if validator.is_in_check(self._opposite_color(self.color)):
-            score += 50
+        # 添加其他评估因素（有Numba时在编译内核中一次完成）
+        if NUMBA_AVAILABLE:
+            squares = np.frombuffer(board.squares, dtype=np.int8)
+            score += evaluate_structure_int8(squares, 1 if self.color == 'white' else -1)
+        else:
+            score += self._evaluate_center_control(board)
+            score += self._evaluate_pawn_structure(board)
 
         return score
 
+    def _evaluate_relative(self, board, validator=None, move_count=None):
+        """以当前行棋方视角返回_evaluate_board的评估值（供Negamax使用）"""
+        score = self._evaluate_board(board, validator, move_count)
+        return score if board.current_turn == self.color else -score
+
+    def _evaluate_material(self, board):
+        """
+        扫描整个棋盘计算子力和位置价值（白方视角），作为增量评估的初始值
+
+        Returns:
+            tuple: (material_score, psqt_score)
+        """
+        squares = np.frombuffer(board.squares, dtype=np.int8)
+
+        if NUMBA_AVAILABLE:
+            material_score, psqt_score = evaluate_int8(squares, self.MATERIAL_BY_CODE, self.PSQT_BY_CODE)
+            return int(material_score), int(psqt_score)
+
+        # 无Numba时子力由位棋盘的置位计数得到，位置价值用NumPy一次花式索引代替64次Python循环
+        material_score = sum(value * popcount(bitboard)
+                             for value, bitboard in zip(self.CODE_MATERIAL, board.bitboards))
+        psqt_score = self.PSQT_BY_CODE[squares, self.SQUARE_INDEX].sum()
+        return int(material_score), int(psqt_score)
+
     def _evaluate_center_control(self, board):
-        """评估中心控制"""
-        score = 0
-        # 中心格子：d4, e4, d5, e5 (行列坐标)
-        center_squares = [(3, 3), (3, 4), (4, 3), (4, 4)]
-        # 扩展中心：c3-f3, c4-f4, c5-f5, c6-f6
-        extended_center = [
-            (2, 2), (2, 3), (2, 4), (2, 5),
-            (3, 2), (3, 5),
-            (4, 2), (4, 5),
-            (5, 2), (5, 3), (5, 4), (5, 5)
-        ]
-
-        # 评估中心控制
-        for row, col in center_squares:
-            piece = board.get_piece(row, col)
-            if piece != board.EMPTY:
-                piece_color = 'white' if board.is_white_piece(piece) else 'black'
-                if piece_color == self.color:
-                    score += 30  # 占据中心奖励
-                else:
-                    score -= 30
-
-        # 评估扩展中心控制
-        for row, col in extended_center:
-            piece = board.get_piece(row, col)
-            if piece != board.EMPTY:
-                piece_color = 'white' if board.is_white_piece(piece) else 'black'
-                if piece_color == self.color:
-                    score += 10  # 占据扩展中心奖励
-                else:
-                    score -= 10
+        """评估中心控制（用位棋盘掩码统计双方占据的中心格数）"""
+        bitboards = board.bitboards
+        white = bitboards[1] | bitboards[2] | bitboards[3] | bitboards[4] | bitboards[5] | bitboards[6]
+        black = board.occupancy ^ white
 
-        return score
+        # 占据中心奖励30，占据扩展中心奖励10（白方视角）
+        center = popcount(white & self.CENTER_MASK) - popcount(black & self.CENTER_MASK)
+        extended = (popcount(white & self.EXTENDED_CENTER_MASK) -
+                    popcount(black & self.EXTENDED_CENTER_MASK))
+        score = 30 * center + 10 * extended
+
+        return score if self.color == 'white' else -score
 
     def _evaluate_pawn_structure(self, board):
         """评估兵型结构"""
+        squares = board.squares
+        ai_pawn = 1 if self.color == 'white' else -1
+        opponent_pawn = -ai_pawn
         score = 0
 
-        # 评估双兵（同一列有两个或更多兵）和孤兵（相邻列没有己方兵）
+        # 统计每一列双方兵的数量，同时奖励连兵和兵链（斜后方有己方兵保护）
+        # 只遍历双方棋子所在的格子
+        ai_pawns = [0] * 8
+        opponent_pawns = [0] * 8
+        piece_squares = board.piece_squares
+        for square in (*piece_squares['white'], *piece_squares['black']):
+            code = squares[square]
+            if code != ai_pawn and code != opponent_pawn:
+                continue
+
+            row, col = divmod(square, 8)
+            if code == ai_pawn:
+                ai_pawns[col] += 1
+            else:
+                opponent_pawns[col] += 1
+
+            # 白兵的保护者在下一行，黑兵在上一行；兵的编码即为+1/-1
+            protect_row = row + code
+            if 0 <= protect_row < 8:
+                protect_square = protect_row * 8 + col
+                for protect_col, offset in ((col - 1, -1), (col + 1, 1)):
+                    if 0 <= protect_col < 8 and squares[protect_square + offset] == code:
+                        if code == ai_pawn:
+                            score += 8  # 奖励兵链
+                        else:
+                            score -= 8
+
         for col in range(8):
-            ai_pawns_in_col = []
-            opponent_pawns_in_col = []
-
-            for row in range(8):
-                piece = board.get_piece(row, col)
-                if piece.upper() == 'P':
-                    piece_color = 'white' if board.is_white_piece(piece) else 'black'
-                    if piece_color == self.color:
-                        ai_pawns_in_col.append(row)
-                    else:
-                        opponent_pawns_in_col.append(row)
-
-            # 惩罚双兵
-            if len(ai_pawns_in_col) > 1:
-                score -= 20 * (len(ai_pawns_in_col) - 1)
-            if len(opponent_pawns_in_col) > 1:
-                score += 20 * (len(opponent_pawns_in_col) - 1)
-
-            # 检查孤兵（相邻列没有己方兵保护）
-            if len(ai_pawns_in_col) > 0:
-                has_support = False
-                for adj_col in [col - 1, col + 1]:
-                    if 0 <= adj_col < 8:
-                        for row in range(8):
-                            piece = board.get_piece(row, adj_col)
-                            if piece.upper() == 'P':
-                                piece_color = 'white' if board.is_white_piece(piece) else 'black'
-                                if piece_color == self.color:
-                                    has_support = True
-                                    break
+            # 惩罚双兵（同一列有两个或更多兵）
+            if ai_pawns[col] > 1:
+                score -= 20 * (ai_pawns[col] - 1)
+            if opponent_pawns[col] > 1:
+                score += 20 * (opponent_pawns[col] - 1)
+
+            # 惩罚孤兵（相邻列没有己方兵保护）
+            if ai_pawns[col] > 0:
+                has_support = ((col > 0 and ai_pawns[col - 1] > 0) or
+                               (col < 7 and ai_pawns[col + 1] > 0))
                 if not has_support:
-                    score -= 15  # 惩罚孤兵
-
-        # 奖励连兵和兵链
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece.upper() == 'P':
-                    piece_color = 'white' if board.is_white_piece(piece) else 'black'
-                    is_ai = piece_color == self.color
-                    is_white = board.is_white_piece(piece)
-
-                    # 检查是否有斜向保护（兵链）
-                    protect_row = row + (1 if is_white else -1)
-                    for protect_col in [col - 1, col + 1]:
-                        if 0 <= protect_row < 8 and 0 <= protect_col < 8:
-                            protect_piece = board.get_piece(protect_row, protect_col)
-                            if protect_piece.upper() == 'P':
-                                protect_color = 'white' if board.is_white_piece(protect_piece) else 'black'
-                                if protect_color == piece_color:
-                                    if is_ai:
-                                        score += 8  # 奖励兵链
-                                    else:
-                                        score -= 8
+                    score -= 15
 
         return score
 
-    def _execute_move(self, board, from_row, from_col, to_row, to_col):
+    def _make_move(self, board, move):
         """
-        在棋盘上执行移动（简化版本，仅用于AI搜索）
+        在棋盘上原地执行移动（ChessBoard.make_move），并增量更新子力和位置价值
 
         Args:
             board: ChessBoard实例
-            from_row, from_col: 起始位置
-            to_row, to_col: 目标位置
-        """
-        piece = board.get_piece(from_row, from_col)
-        piece_type = piece.upper()
-        is_white = board.is_white_piece(piece)
-
-        # 处理吃过路兵
-        if piece_type == 'P' and board.en_passant_target == (to_row, to_col):
-            en_passant_row = to_row + (1 if is_white else -1)
-            board.set_piece(en_passant_row, to_col, board.EMPTY)
-
-        # 处理王车易位
-        elif piece_type == 'K' and abs(to_col - from_col) == 2:
-            is_kingside = to_col > from_col
-            rook_col = 7 if is_kingside else 0
-            rook_new_col = 5 if is_kingside else 3
-            rook = board.get_piece(from_row, rook_col)
-            board.set_piece(from_row, rook_new_col, rook)
-            board.set_piece(from_row, rook_col, board.EMPTY)
-
-        # 执行移动
-        board.set_piece(to_row, to_col, piece)
-        board.set_piece(from_row, from_col, board.EMPTY)
-
-        # 更新王的位置
-        if piece_type == 'K':
-            if is_white:
-                board.white_king_pos = (to_row, to_col)
-            else:
-                board.black_king_pos = (to_row, to_col)
-
-        # 处理兵升变（默认升变为后）
-        if piece_type == 'P':
-            promotion_row = 0 if is_white else 7
-            if to_row == promotion_row:
-                promoted = 'Q' if is_white else 'q'
-                board.set_piece(to_row, to_col, promoted)
+            move: ((from_row, from_col), (to_row, to_col))
 
-        # 更新吃过路兵目标
-        board.en_passant_target = None
-        if piece_type == 'P' and abs(to_row - from_row) == 2:
-            en_passant_row = from_row + (1 if is_white else -1)
-            board.en_passant_target = (en_passant_row, to_col)
-
-        # 更新王车易位标志
-        if piece_type == 'K':
-            if is_white:
-                board.white_king_moved = True
-            else:
-                board.black_king_moved = True
-        elif piece_type == 'R':
-            if is_white:
-                if from_col == 7:
-                    board.white_rook_king_side_moved = True
-                elif from_col == 0:
-                    board.white_rook_queen_side_moved = True
+        Returns:
+            UndoInfo: 撤销信息，交给_undo_move恢复局面
+        """
+        (from_row, from_col), (to_row, to_col) = move
+        squares = board.squares
+        from_square = from_row * 8 + from_col
+        to_square = to_row * 8 + to_col
+        piece = squares[from_square]
+        captured = squares[to_square]
+
+        undo = board.make_move(move)
+
+        # 移动的棋子离开起点、到达终点（升变时到达终点的是后），被吃的棋子移出；空格的表值为0
+        material = self.CODE_MATERIAL
+        psqt = self.CODE_PSQT
+        arrived = squares[to_square]
+        material_score = board.material_score + material[arrived] - material[piece] - material[captured]
+        psqt_score = (board.psqt_score + psqt[arrived * 64 + to_square]
+                      - psqt[piece * 64 + from_square] - psqt[captured * 64 + to_square])
+
+        if undo.en_passant_captured is not None:
+            # 被吃过路兵吃掉的是对方的兵，位于起点所在行
+            en_passant_square = from_row * 8 + to_col
+            material_score -= material[-piece]
+            psqt_score -= psqt[-piece * 64 + en_passant_square]
+        elif (piece == 6 or piece == -6) and abs(to_col - from_col) == 2:
+            # 王车易位时车的位置变化
+            rook = 4 if piece > 0 else -4
+            if to_col > from_col:
+                psqt_score += psqt[rook * 64 + from_row * 8 + 5] - psqt[rook * 64 + from_row * 8 + 7]
             else:
-                if from_col == 7:
-                    board.black_rook_king_side_moved = True
-                elif from_col == 0:
-                    board.black_rook_queen_side_moved = True
+                psqt_score += psqt[rook * 64 + from_row * 8 + 3] - psqt[rook * 64 + from_row * 8]
 
-        # 切换回合
-        board.switch_turn()
+        board.material_score = material_score
+        board.psqt_score = psqt_score
+        return undo
 
-    def _opposite_color(self, color):
-        """获取对方颜色"""
-        return 'black' if color == 'white' else 'white'
+    def _undo_move(self, board, move, undo):
+        """
+        撤销_make_move执行的移动（评估值随UndoInfo一起恢复）
+
+        Args:
+            board: ChessBoard实例
+            move: ((from_row, from_col), (to_row, to_col))
+            undo: _make_move返回的撤销信息
+        """
+        board.unmake_move(move, undo)
@@ -0,0 +1,127 @@
+"""
+国际象棋AI模块 - Numba加速的评估内核
+在int8一维棋盘（ChessBoard.squares）上计算子力、位置价值、中心控制和兵型结构
+"""
+import numpy as np
+from movegen_tables import CENTER_SQUARES, EXTENDED_CENTER_SQUARES
+
+# 尝试导入Numba，如果失败则由调用方退回纯Python实现
+try:
+    from numba import njit, int8, int32, int64, types
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def build_code_tables(material, psqt, piece_codes):
+    """
+    将按棋子字符索引的估值表转换为按整数编码索引的数组
+
+    黑方棋子编码为负数，按行号 code % 13 存放，
+    因此内核中可以直接用 table[code] 取值（负下标自动回绕）
+
+    Args:
+        material: {棋子字符: 子力价值}
+        psqt: {棋子字符: 64格位置价值}
+        piece_codes: {棋子字符: 整数编码}
+
+    Returns:
+        tuple: (material_table[13], psqt_table[13, 64])，均为int32
+    """
+    material_table = np.zeros(13, dtype=np.int32)
+    psqt_table = np.zeros((13, 64), dtype=np.int32)
+    for piece, code in piece_codes.items():
+        if code == 0:
+            continue
+        material_table[code] = material[piece]
+        psqt_table[code] = psqt[piece]
+    return material_table, psqt_table
+
+
+if NUMBA_AVAILABLE:
+    # 显式签名：导入时即完成编译（cache=True 时从磁盘缓存加载），搜索中不会触发JIT
+    @njit(types.UniTuple(int32, 2)(int8[::1], int32[::1], int32[:, ::1]), cache=True)
+    def evaluate_int8(squares, material_table, psqt_table):
+        """
+        计算子力和位置价值（白方视角）
+
+        Args:
+            squares: int8[64]棋盘，白正黑负
+            material_table: build_code_tables生成的子力表
+            psqt_table: build_code_tables生成的位置价值表
+
+        Returns:
+            tuple: (material_score, psqt_score)
+        """
+        material_score = 0
+        psqt_score = 0
+        for square in range(64):
+            code = squares[square]
+            if code != 0:
+                material_score += material_table[code]
+                psqt_score += psqt_table[code, square]
+        return material_score, psqt_score
+
+    @njit(int64(int8[::1], int64), cache=True)
+    def evaluate_structure_int8(squares, ai_sign):
+        """
+        计算中心控制和兵型结构（AI视角），逻辑与ChessAI._evaluate_center_control
+        和ChessAI._evaluate_pawn_structure相同
+
+        Args:
+            squares: int8[64]棋盘，白正黑负
+            ai_sign: AI为白方时为1，黑方时为-1
+
+        Returns:
+            int: 中心控制与兵型结构评分之和
+        """
+        score = 0
+
+        # 中心控制：棋子编码与AI同号为己方棋子
+        for square in CENTER_SQUARES:
+            code = squares[square] * ai_sign
+            if code > 0:
+                score += 30
+            elif code < 0:
+                score -= 30
+        for square in EXTENDED_CENTER_SQUARES:
+            code = squares[square] * ai_sign
+            if code > 0:
+                score += 10
+            elif code < 0:
+                score -= 10
+
+        # 兵型结构：统计每列兵数并奖励兵链
+        ai_pawns = np.zeros(8, dtype=np.int64)
+        opponent_pawns = np.zeros(8, dtype=np.int64)
+        for square in range(64):
+            code = squares[square]
+            if code != 1 and code != -1:
+                continue
+            row = square // 8
+            col = square % 8
+            if code == ai_sign:
+                ai_pawns[col] += 1
+            else:
+                opponent_pawns[col] += 1
+
+            protect_row = row + code
+            if 0 <= protect_row < 8:
+                protect_square = protect_row * 8 + col
+                if col > 0 and squares[protect_square - 1] == code:
+                    score += 8 if code == ai_sign else -8
+                if col < 7 and squares[protect_square + 1] == code:
+                    score += 8 if code == ai_sign else -8
+
+        for col in range(8):
+            # 双兵
+            if ai_pawns[col] > 1:
+                score -= 20 * (ai_pawns[col] - 1)
+            if opponent_pawns[col] > 1:
+                score += 20 * (opponent_pawns[col] - 1)
+            # 孤兵
+            if ai_pawns[col] > 0:
+                if not ((col > 0 and ai_pawns[col - 1] > 0) or (col < 7 and ai_pawns[col + 1] > 0)):
+                    score -= 15
+
+        return score
@@ -2,6 +2,35 @@
 国际象棋棋盘模块
 实现8x8棋盘、棋子表示和基本操作
 """
+import random
+from array import array
+from collections import namedtuple
+
+# 统计整数二进制中1的个数：Python 3.10+ 使用int.bit_count，否则退回字符串计数
+try:
+    popcount = int.bit_count
+except AttributeError:
+    def popcount(x):
+        return bin(x).count('1')
+
+# Zobrist哈希随机数（固定种子，保证每次运行的哈希值一致，便于调试）
+_zobrist_rng = random.Random(0x5EED)
+
+# make_move返回的撤销信息：移动的棋子、目标格原有棋子、被吃过路兵吃掉的兵（没有则为None），
+# 以及移动前的过路兵目标、6个易位标志、双方王的位置和增量评估值
+UndoInfo = namedtuple('UndoInfo', (
+    'piece', 'captured', 'en_passant_captured', 'en_passant_target',
+    'castling_flags', 'white_king_pos', 'black_king_pos',
+    'material_score', 'psqt_score'))
+
+# 64个格子的代数记谱名称，按 row * 8 + col 索引（第0行为第8横线）
+SQUARE_NAMES = tuple(f"{chr(ord('a') + col)}{8 - row}" for row in range(8) for col in range(8))
+
+
+def square_name(row, col):
+    """返回格子的代数记谱名称，如 (6, 4) -> 'e2'"""
+    return SQUARE_NAMES[row * 8 + col]
+
 
 class ChessBoard:
     """国际象棋棋盘类"""
@@ -25,9 +54,37 @@ class ChessBoard:
         KING: 20000
     }
 
+    # 棋子的整数编码（供数值计算使用）：空格为0，白方为正、黑方为负
+    # 1=兵 2=马 3=象 4=车 5=后 6=王
+    PIECE_CODES = {
+        EMPTY: 0,
+        'P': 1, 'N': 2, 'B': 3, 'R': 4, 'Q': 5, 'K': 6,
+        'p': -1, 'n': -2, 'b': -3, 'r': -4, 'q': -5, 'k': -6
+    }
+
+    # 整数编码 -> 棋子字符，黑方的负编码通过负下标取到末尾的小写字符
+    PIECE_CHARS = (EMPTY, 'P', 'N', 'B', 'R', 'Q', 'K', 'k', 'q', 'r', 'b', 'n', 'p')
+
+    # 棋子字符 -> 颜色，颜色判断只需一次哈希查找，不再调用字符串方法
+    PIECE_COLORS = {piece: 'white' for piece in 'PNBRQK'}
+    PIECE_COLORS.update({piece: 'black' for piece in 'pnbrqk'})
+
+    # Zobrist哈希表：每种棋子在每个格子上的随机数，以及行棋方、易位权、过路兵列
+    ZOBRIST_PIECES = {piece: tuple(_zobrist_rng.getrandbits(64) for _ in range(64))
+                      for piece in 'PNBRQKpnbrqk'}
+    ZOBRIST_BLACK_TO_MOVE = _zobrist_rng.getrandbits(64)
+    ZOBRIST_CASTLING = tuple(_zobrist_rng.getrandbits(64) for _ in range(16))
+    ZOBRIST_EN_PASSANT = tuple(_zobrist_rng.getrandbits(64) for _ in range(8))
+
     def __init__(self):
         """初始化棋盘，设置标准开局位置"""
-        self.board = self._create_initial_board()
+        # 一维int8棋盘（下标为 row * 8 + col，编码见PIECE_CODES），可被NumPy/Numba直接读取
+        self.squares = self._create_initial_board()
+        # 每方棋子所在格子的集合（下标同squares），在set_piece中增量维护，遍历棋子时不必扫描64格
+        self.piece_squares = self._collect_piece_squares()
+        # 位棋盘：bitboards[code]的第square位表示该格有此棋子（黑方负编码经负下标回绕，同估值表），
+        # occupancy为所有棋子占据的格子；均在set_piece中增量维护
+        self.bitboards, self.occupancy = self._collect_bitboards()
         self.current_turn = 'white'  # 白方先行
         self.move_history = []  # 移动历史
         self.captured_pieces = []  # 被吃棋子
@@ -47,6 +104,13 @@ class ChessBoard:
         self.white_king_pos = (7, 4)
         self.black_king_pos = (0, 4)
 
+        # 棋子布局的Zobrist哈希（在set_piece中增量更新）
+        self.zobrist_hash = self._compute_zobrist_hash()
+
+        # 子力与位置价值（白方视角），由ChessAI在搜索开始时计算并在搜索中增量维护
+        self.material_score = 0
+        self.psqt_score = 0
+
     def _create_initial_board(self):
         """创建初始棋盘布局
 
@@ -54,6 +118,9 @@ class ChessBoard:
         - 大写字母代表白方棋子
         - 小写字母代表黑方棋子
         - '.' 代表空格
+
+        Returns:
+            array: 按PIECE_CODES编码的64格int8数组
         """
         board = []
 
@@ -70,64 +137,274 @@ class ChessBoard:
         board.append([self.ROOK, self.KNIGHT, self.BISHOP, self.QUEEN,
                      self.KING, self.BISHOP, self.KNIGHT, self.ROOK])
 
-        return board
+        return array('b', [self.PIECE_CODES[piece] for row in board for piece in row])
+
+    def _collect_piece_squares(self):
+        """从squares收集双方棋子所在的格子"""
+        piece_squares = {'white': set(), 'black': set()}
+        for square, code in enumerate(self.squares):
+            if code > 0:
+                piece_squares['white'].add(square)
+            elif code < 0:
+                piece_squares['black'].add(square)
+        return piece_squares
+
+    def _collect_bitboards(self):
+        """从squares构建每种棋子的位棋盘和总占据位棋盘"""
+        bitboards = [0] * 13
+        occupancy = 0
+        for square, code in enumerate(self.squares):
+            if code:
+                bitboards[code] |= 1 << square
+                occupancy |= 1 << square
+        return bitboards, occupancy
+
+    def count(self, piece_type, color):
+        """
+        统计棋盘上某一方某种棋子的数量（对该棋子位棋盘做一次popcount）
+
+        Args:
+            piece_type: 棋子类型（'P', 'N', 'B', 'R', 'Q', 'K'）
+            color: 'white' 或 'black'
+
+        Returns:
+            int: 棋子数量
+        """
+        code = self.PIECE_CODES[piece_type]
+        return popcount(self.bitboards[code if color == 'white' else -code])
 
     def get_piece(self, row, col):
         """获取指定位置的棋子"""
         if 0 <= row < 8 and 0 <= col < 8:
-            return self.board[row][col]
+            return self.PIECE_CHARS[self.squares[row * 8 + col]]
         return None
 
     def set_piece(self, row, col, piece):
-        """设置指定位置的棋子"""
+        """设置指定位置的棋子（同时增量更新Zobrist哈希、双方棋子格子集合和位棋盘）"""
         if 0 <= row < 8 and 0 <= col < 8:
-            self.board[row][col] = piece
+            square = row * 8 + col
+            bit = 1 << square
+            old_code = self.squares[square]
+            if old_code:
+                self.zobrist_hash ^= self.ZOBRIST_PIECES[self.PIECE_CHARS[old_code]][square]
+                self.piece_squares['white' if old_code > 0 else 'black'].discard(square)
+                self.bitboards[old_code] ^= bit
+                self.occupancy ^= bit
+            code = self.PIECE_CODES[piece]
+            if code:
+                self.zobrist_hash ^= self.ZOBRIST_PIECES[piece][square]
+                self.piece_squares['white' if code > 0 else 'black'].add(square)
+                self.bitboards[code] |= bit
+                self.occupancy |= bit
+            self.squares[square] = code
+
+    def _compute_zobrist_hash(self):
+        """从头计算棋子布局的Zobrist哈希"""
+        h = 0
+        for square, code in enumerate(self.squares):
+            if code:
+                h ^= self.ZOBRIST_PIECES[self.PIECE_CHARS[code]][square]
+        return h
+
+    def zobrist_key(self):
+        """
+        获取完整局面的Zobrist键
+
+        棋子布局部分在set_piece中增量维护；行棋方、王车易位权和吃过路兵
+        目标会被外部代码直接赋值，因此在这里按当前状态合并进哈希。
+
+        Returns:
+            int: 64位局面哈希值
+        """
+        key = self.zobrist_hash
+        if self.current_turn == 'black':
+            key ^= self.ZOBRIST_BLACK_TO_MOVE
+
+        castling = 0
+        if not self.white_king_moved:
+            if not self.white_rook_king_side_moved:
+                castling |= 1
+            if not self.white_rook_queen_side_moved:
+                castling |= 2
+        if not self.black_king_moved:
+            if not self.black_rook_king_side_moved:
+                castling |= 4
+            if not self.black_rook_queen_side_moved:
+                castling |= 8
+        key ^= self.ZOBRIST_CASTLING[castling]
+
+        if self.en_passant_target:
+            key ^= self.ZOBRIST_EN_PASSANT[self.en_passant_target[1]]
+
+        return key
 
     def is_white_piece(self, piece):
         """判断是否为白方棋子"""
-        return piece.isupper() and piece != self.EMPTY
+        return self.PIECE_COLORS.get(piece) == 'white'
 
     def is_black_piece(self, piece):
         """判断是否为黑方棋子"""
-        return piece.islower() and piece != self.EMPTY
+        return self.PIECE_COLORS.get(piece) == 'black'
 
     def get_piece_color(self, piece):
         """获取棋子颜色"""
-        if self.is_white_piece(piece):
-            return 'white'
-        elif self.is_black_piece(piece):
-            return 'black'
-        return None
+        return self.PIECE_COLORS.get(piece)
 
     def is_enemy_piece(self, piece1, piece2):
         """判断两个棋子是否为敌对方"""
-        if piece1 == self.EMPTY or piece2 == self.EMPTY:
-            return False
-        return self.get_piece_color(piece1) != self.get_piece_color(piece2)
+        color1 = self.PIECE_COLORS.get(piece1)
+        color2 = self.PIECE_COLORS.get(piece2)
+        return color1 is not None and color2 is not None and color1 != color2
 
     def switch_turn(self):
         """切换回合"""
         self.current_turn = 'black' if self.current_turn == 'white' else 'white'
 
+    def make_move(self, move):
+        """
+        在棋盘上原地执行移动（用于搜索，不记录移动历史和被吃棋子，兵默认升变为后）
+
+        Args:
+            move: ((from_row, from_col), (to_row, to_col))
+
+        Returns:
+            UndoInfo: 撤销信息，交给unmake_move恢复局面
+        """
+        (from_row, from_col), (to_row, to_col) = move
+        piece = self.get_piece(from_row, from_col)
+        captured = self.get_piece(to_row, to_col)
+        piece_type = piece.upper()
+        is_white = piece_type == piece
+
+        # 吃过路兵时被吃掉的兵不在目标格，需单独记录
+        en_passant_captured = None
+        if piece_type == self.PAWN and self.en_passant_target == (to_row, to_col):
+            en_passant_row = to_row + (1 if is_white else -1)
+            if self.get_piece(en_passant_row, to_col) != self.EMPTY:
+                en_passant_captured = self.get_piece(en_passant_row, to_col)
+
+        undo = UndoInfo(
+            piece,
+            captured,
+            en_passant_captured,
+            self.en_passant_target,
+            (self.white_king_moved, self.white_rook_king_side_moved,
+             self.white_rook_queen_side_moved, self.black_king_moved,
+             self.black_rook_king_side_moved, self.black_rook_queen_side_moved),
+            self.white_king_pos,
+            self.black_king_pos,
+            self.material_score,
+            self.psqt_score,
+        )
+
+        # 处理吃过路兵
+        if en_passant_captured is not None:
+            self.set_piece(en_passant_row, to_col, self.EMPTY)
+
+        # 处理王车易位
+        elif piece_type == self.KING and abs(to_col - from_col) == 2:
+            is_kingside = to_col > from_col
+            rook_col = 7 if is_kingside else 0
+            rook_new_col = 5 if is_kingside else 3
+            self.set_piece(from_row, rook_new_col, self.get_piece(from_row, rook_col))
+            self.set_piece(from_row, rook_col, self.EMPTY)
+
+        # 执行移动
+        self.set_piece(to_row, to_col, piece)
+        self.set_piece(from_row, from_col, self.EMPTY)
+
+        if piece_type == self.KING:
+            # 更新王的位置和易位标志
+            if is_white:
+                self.white_king_pos = (to_row, to_col)
+                self.white_king_moved = True
+            else:
+                self.black_king_pos = (to_row, to_col)
+                self.black_king_moved = True
+        elif piece_type == self.ROOK:
+            if is_white:
+                if from_col == 7:
+                    self.white_rook_king_side_moved = True
+                elif from_col == 0:
+                    self.white_rook_queen_side_moved = True
+            else:
+                if from_col == 7:
+                    self.black_rook_king_side_moved = True
+                elif from_col == 0:
+                    self.black_rook_queen_side_moved = True
+
+        # 处理兵升变（默认升变为后）并更新吃过路兵目标
+        self.en_passant_target = None
+        if piece_type == self.PAWN:
+            if to_row == (0 if is_white else 7):
+                self.set_piece(to_row, to_col, self.QUEEN if is_white else 'q')
+            elif abs(to_row - from_row) == 2:
+                self.en_passant_target = ((from_row + to_row) // 2, to_col)
+
+        self.switch_turn()
+
+        return undo
+
+    def unmake_move(self, move, undo):
+        """
+        撤销make_move执行的移动，恢复棋子、王的位置、易位标志、过路兵目标和评估值
+
+        Args:
+            move: ((from_row, from_col), (to_row, to_col))
+            undo: make_move返回的UndoInfo
+        """
+        (from_row, from_col), (to_row, to_col) = move
+        piece = undo.piece
+
+        self.switch_turn()
+
+        # 恢复原位置的棋子（升变的后也在此还原为兵）
+        self.set_piece(from_row, from_col, piece)
+        self.set_piece(to_row, to_col, undo.captured)
+
+        # 恢复被吃过路兵吃掉的兵
+        if undo.en_passant_captured is not None:
+            en_passant_row = to_row + (1 if piece.isupper() else -1)
+            self.set_piece(en_passant_row, to_col, undo.en_passant_captured)
+
+        # 车回到易位前的位置
+        elif piece.upper() == self.KING and abs(to_col - from_col) == 2:
+            is_kingside = to_col > from_col
+            rook_col = 7 if is_kingside else 0
+            rook_new_col = 5 if is_kingside else 3
+            self.set_piece(from_row, rook_col, self.get_piece(from_row, rook_new_col))
+            self.set_piece(from_row, rook_new_col, self.EMPTY)
+
+        self.en_passant_target = undo.en_passant_target
+        (self.white_king_moved, self.white_rook_king_side_moved,
+         self.white_rook_queen_side_moved, self.black_king_moved,
+         self.black_rook_king_side_moved, self.black_rook_queen_side_moved) = undo.castling_flags
+        self.white_king_pos = undo.white_king_pos
+        self.black_king_pos = undo.black_king_pos
+        self.material_score = undo.material_score
+        self.psqt_score = undo.psqt_score
+
     def copy(self):
         """创建棋盘的深拷贝"""
-        new_board = ChessBoard()
-        new_board.board = [row[:] for row in self.board]
-        new_board.current_turn = self.current_turn
+        new_board = self.fast_copy_for_search()
         new_board.move_history = self.move_history[:]
         new_board.captured_pieces = self.captured_pieces[:]
+        return new_board
 
-        new_board.white_king_moved = self.white_king_moved
-        new_board.white_rook_king_side_moved = self.white_rook_king_side_moved
-        new_board.white_rook_queen_side_moved = self.white_rook_queen_side_moved
-        new_board.black_king_moved = self.black_king_moved
-        new_board.black_rook_king_side_moved = self.black_rook_king_side_moved
-        new_board.black_rook_queen_side_moved = self.black_rook_queen_side_moved
-
-        new_board.en_passant_target = self.en_passant_target
-        new_board.white_king_pos = self.white_king_pos
-        new_board.black_king_pos = self.black_king_pos
+    def fast_copy_for_search(self):
+        """
+        创建供搜索和走法校验使用的棋盘拷贝
 
+        不经过__init__（不重建初始布局和哈希），不复制移动历史和被吃棋子；
+        标志、王的位置等不可变的值直接共享，只复制可变的棋盘容器
+        """
+        new_board = self.__class__.__new__(self.__class__)
+        new_board.__dict__.update(self.__dict__)
+        new_board.squares = self.squares[:]
+        new_board.piece_squares = {color: squares.copy() for color, squares in self.piece_squares.items()}
+        new_board.bitboards = self.bitboards[:]
+        new_board.move_history = []
+        new_board.captured_pieces = []
         return new_board
 
     def to_fen(self):
@@ -135,7 +412,7 @@ class ChessBoard:
         fen_parts = []
 
         # 1. 棋盘布局
-        for row in self.board:
+        for row in self._rows():
             empty_count = 0
             row_str = ''
             for piece in row:
@@ -173,16 +450,19 @@ class ChessBoard:
         # 4. 吃过路兵目标
         en_passant = '-'
         if self.en_passant_target:
-            col = chr(ord('a') + self.en_passant_target[1])
-            row = str(8 - self.en_passant_target[0])
-            en_passant = col + row
+            en_passant = square_name(*self.en_passant_target)
 
         return f"{board_fen} {turn} {castling} {en_passant} 0 1"
 
+    def _rows(self):
+        """按行返回棋子字符列表（用于输出）"""
+        chars = [self.PIECE_CHARS[code] for code in self.squares]
+        return [chars[row * 8:row * 8 + 8] for row in range(8)]
+
     def __str__(self):
         """打印棋盘（用于调试）"""
         result = "  a b c d e f g h\n"
-        for i, row in enumerate(self.board):
+        for i, row in enumerate(self._rows()):
             result += f"{8-i} {' '.join(row)} {8-i}\n"
         result += "  a b c d e f g h"
         return result
@@ -2,7 +2,7 @@
 游戏管理器模块
 负责执行移动、更新游戏状态、处理特殊规则
 """
-from chess_board import ChessBoard
+from chess_board import ChessBoard, square_name
 from move_validator import MoveValidator
 
 
@@ -100,7 +100,8 @@ class GameManager:
         # 更新吃过路兵目标
         self.board.en_passant_target = None
         if piece_type == self.board.PAWN and abs(to_row - from_row) == 2:
-            en_passant_row = from_row + (1 if is_white else -1)
+            # 目标是兵越过的格子（白兵向上走，行号减小）
+            en_passant_row = (from_row + to_row) // 2
             self.board.en_passant_target = (en_passant_row, to_col)
 
         # 更新王车易位标志
@@ -163,13 +164,9 @@ class GameManager:
         if self.board.get_piece_color(piece) != self.board.current_turn:
             return []
 
-        legal_moves = []
-        for to_row in range(8):
-            for to_col in range(8):
-                if self.validator.is_valid_move(row, col, to_row, to_col):
-                    legal_moves.append((to_row, to_col))
-
-        return legal_moves
+        # 只校验该棋子几何上可达的目标格，而不是全部64格
+        return [(to_row, to_col) for to_row, to_col in self.validator.generate_moves_from(row, col)
+                if self.validator.is_valid_move(row, col, to_row, to_col)]
 
     def is_check(self):
         """检查当前回合方是否被将军"""
@@ -212,8 +209,8 @@ class GameManager:
         Returns:
             str: 如 "e2e4", "e7e8q"（兵升变）
         """
-        from_pos = chr(ord('a') + from_col) + str(8 - from_row)
-        to_pos = chr(ord('a') + to_col) + str(8 - to_row)
+        from_pos = square_name(from_row, from_col)
+        to_pos = square_name(to_row, to_col)
 
         # 检查是否是兵升变
         piece = self.board.get_piece(from_row, from_col)
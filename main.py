@@ -2,21 +2,90 @@
 国际象棋主程序
 整合所有模块，提供游戏入口
 """
+import argparse
 import sys
 from game_manager import GameManager
 from chess_ai import ChessAI
-from chess_ai_gpu import ChessAIGPU
-from ui.pygame_ui import PygameUI
-from ai_self_play import AISelfPlay
+
+# GPU版AI（导入时探测CuPy/CUDA）、自对弈和Pygame界面较重，只在选中对应模式时才导入
+
+
+def _search_depth(value):
+    """--depth的参数类型：1到置换表能记录的最大深度之间的整数"""
+    try:
+        depth = int(value)
+    except ValueError:
+        depth = 0
+    if not 1 <= depth <= ChessAI.TT_MAX_DEPTH:
+        raise argparse.ArgumentTypeError(f"搜索深度须在1到{ChessAI.TT_MAX_DEPTH}之间: {value}")
+    return depth
+
+
+def _positive_int(value):
+    """--jobs、--self-play-games的参数类型：正整数"""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"须为正整数: {value}")
+    return number
+
+
+def parse_args(argv=None):
+    """解析命令行参数；没有任何参数时走交互式菜单"""
+    parser = argparse.ArgumentParser(description="国际象棋程序")
+    parser.add_argument('--mode', choices=['1', '2', '3', '4'],
+                        help="游戏模式：1人机(执白) 2人机(执黑) 3双人 4AI自对弈")
+    parser.add_argument('--depth', type=_search_depth, default=6,
+                        help=f"AI搜索深度，1-{ChessAI.TT_MAX_DEPTH}（默认6）")
+    parser.add_argument('--gpu', dest='gpu', action='store_true', help="使用GPU加速")
+    parser.add_argument('--no-gpu', dest='gpu', action='store_false', help="使用CPU（默认）")
+    parser.add_argument('--self-play-games', type=_positive_int, default=None, metavar='N',
+                        help="模式4下连续自对弈N局（不显示棋盘、不延迟），最后输出每秒评估节点数")
+    parser.add_argument('--jobs', type=_positive_int, default=1,
+                        help="模式4下根节点并行搜索的进程数（默认1，不并行）")
+    return parser.parse_args(argv)
+
+
+def run_self_play_benchmark(games, ai_depth, use_gpu, jobs):
+    """连续自对弈games局并汇总评估节点数和用时，用作性能测试"""
+    from ai_self_play import AISelfPlay
+
+    total_nodes = 0
+    total_time = 0.0
+    for game in range(games):
+        self_play = AISelfPlay(white_depth=ai_depth, black_depth=ai_depth, display_board=False,
+                               delay=0, use_gpu=use_gpu, benchmark=True, jobs=jobs)
+        result = self_play.play_game()
+        total_nodes += result['nodes']
+        total_time += result['duration']
+
+    print("=" * 50)
+    print(f"自对弈 {games} 局，深度 {ai_depth}，共评估 {total_nodes} 节点，用时 {total_time:.2f} 秒")
+    if total_time > 0:
+        print(f"每秒评估节点数: {total_nodes / total_time:.0f}")
 
 
 def main():
     """主函数"""
+    # 给出任何命令行参数时跳过所有input()提示，便于脚本化运行和性能测试
+    args = parse_args()
+    interactive = len(sys.argv) == 1
+
     print("=" * 50)
     print("国际象棋程序")
     print("=" * 50)
     print()
 
+    if not interactive:
+        mode = args.mode or '1'
+        if mode == '4' and args.self_play_games is not None:
+            run_self_play_benchmark(args.self_play_games, args.depth, args.gpu, args.jobs)
+            return
+        start_game(mode, args.depth, args.gpu, args.jobs)
+        return
+
     # 询问游戏模式
     print("请选择游戏模式:")
     print("1. 人机对战（玩家执白，AI执黑）")
@@ -31,11 +100,7 @@ def main():
         print("\n程序退出")
         sys.exit(0)
 
-    # 创建游戏管理器
-    game_manager = GameManager()
-
     # AI配置
-    ai_player = None
     ai_depth = 6  # 默认搜索深度
     use_gpu = False  # 默认不使用GPU
 
@@ -80,10 +145,28 @@ def main():
 
         use_gpu = (use_gpu_choice == '1')
 
+    start_game(mode, ai_depth, use_gpu)
+
+
+def start_game(mode, ai_depth, use_gpu, jobs=1):
+    """
+    按所选模式创建AI并启动游戏
+
+    Args:
+        mode: 游戏模式 '1'-'4'
+        ai_depth: AI搜索深度
+        use_gpu: 是否使用GPU加速
+        jobs: 模式4下根节点并行搜索的进程数
+    """
+    # 创建游戏管理器
+    game_manager = GameManager()
+    ai_player = None
+
     # 根据模式创建AI
     if mode == '1':
         # 玩家执白，AI执黑
         if use_gpu:
+            from chess_ai_gpu import ChessAIGPU
             ai_player = ChessAIGPU(game_manager.board, color='black', max_depth=ai_depth, use_gpu=True)
             print(f"\n游戏开始! 玩家执白，AI执黑（GPU加速，搜索深度: {ai_depth}层）")
         else:
@@ -94,6 +177,7 @@ def main():
     elif mode == '2':
         # 玩家执黑，AI执白
         if use_gpu:
+            from chess_ai_gpu import ChessAIGPU
             ai_player = ChessAIGPU(game_manager.board, color='white', max_depth=ai_depth, use_gpu=True)
             print(f"\n游戏开始! AI执白，玩家执黑（GPU加速，搜索深度: {ai_depth}层）")
         else:
@@ -114,12 +198,14 @@ def main():
         print()
 
         # 创建自对弈实例
+        from ai_self_play import AISelfPlay
         self_play = AISelfPlay(
             white_depth=ai_depth,
             black_depth=ai_depth,
             display_board=True,
             delay=0.5,
-            use_gpu=use_gpu
+            use_gpu=use_gpu,
+            jobs=jobs
         )
 
         # 开始对弈
@@ -132,6 +218,7 @@ def main():
     else:
         print("无效选项，使用默认模式（玩家执白，AI执黑）")
         if use_gpu:
+            from chess_ai_gpu import ChessAIGPU
             ai_player = ChessAIGPU(game_manager.board, color='black', max_depth=ai_depth, use_gpu=True)
         else:
             ai_player = ChessAI(game_manager.board, color='black', max_depth=ai_depth)
@@ -141,6 +228,7 @@ def main():
 
     # 创建并运行Pygame界面
     try:
+        from ui.pygame_ui import PygameUI
         ui = PygameUI(game_manager)
         ui.run(ai_player)
     except KeyboardInterrupt:
@@ -2,12 +2,25 @@
 移动规则验证器模块
 实现所有棋子的合法走法校验，包括特殊规则
 """
+from collections import OrderedDict
 from chess_board import ChessBoard
+from movegen_tables import (KNIGHT_MOVES, KING_MOVES, RAY_SQUARES, ROOK_RAYS, BISHOP_RAYS, QUEEN_RAYS,
+                            KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKERS, BETWEEN, rook_attacks, bishop_attacks)
+
+
+# 所有 ((from_row, from_col), (to_row, to_col)) 移动元组，按 from_sq * 64 + to_sq 索引，
+# 生成走法时复用同一批对象，使缓存中的走法列表只保存引用
+_MOVES = tuple(((from_sq // 8, from_sq % 8), (to_sq // 8, to_sq % 8))
+               for from_sq in range(64) for to_sq in range(64))
+
 
 
 class MoveValidator:
     """移动规则验证器类"""
 
+    # 合法移动缓存的容量（局面数），写满约10MB，超出时淘汰最久未使用的局面
+    LEGAL_MOVES_CACHE_SIZE = 1 << 14
+
     def __init__(self, board):
         """
         初始化验证器
@@ -17,6 +30,15 @@ class MoveValidator:
         """
         self.board = board
 
+        # 合法移动缓存：(Zobrist键, 吃过路兵目标, 颜色) -> 移动元组，按LRU淘汰；
+        # 属于该验证器（及其棋盘），新对局使用新的验证器，不会影响其他棋盘的缓存
+        self._legal_moves_cache = OrderedDict()
+
+        # 按棋子类型编码（1=兵 2=马 3=象 4=车 5=后 6=王）索引的走法校验函数
+        self._move_validators = (None, self._is_valid_pawn_move, self._is_valid_knight_move,
+                                 self._is_valid_bishop_move, self._is_valid_rook_move,
+                                 self._is_valid_queen_move, self._is_valid_king_move)
+
     def is_valid_move(self, from_row, from_col, to_row, to_col, check_king_safety=True):
         """
         验证移动是否合法
@@ -36,11 +58,12 @@ class MoveValidator:
                 0 <= to_row < 8 and 0 <= to_col < 8):
             return False
 
-        piece = self.board.get_piece(from_row, from_col)
-        target = self.board.get_piece(to_row, to_col)
+        # 颜色判断直接比较整数编码的符号：白方为正、黑方为负、空格为0
+        squares = self.board.squares
+        piece_code = squares[from_row * 8 + from_col]
 
         # 检查起始位置是否有棋子
-        if piece == self.board.EMPTY:
+        if piece_code == 0:
             return False
 
         # 检查是否移动到相同位置
@@ -48,31 +71,16 @@ class MoveValidator:
             return False
 
         # 检查是否轮到该方移动
-        piece_color = self.board.get_piece_color(piece)
-        if piece_color != self.board.current_turn:
+        if (piece_code > 0) != (self.board.current_turn == 'white'):
             return False
 
-        # 检查目标位置是否有己方棋子
-        if target != self.board.EMPTY:
-            if self.board.get_piece_color(target) == piece_color:
-                return False
+        # 检查目标位置是否有己方棋子（编码同号）
+        if piece_code * squares[to_row * 8 + to_col] > 0:
+            return False
 
-        # 根据棋子类型验证移动
-        piece_type = piece.upper()
-        is_valid = False
-
-        if piece_type == self.board.PAWN:
-            is_valid = self._is_valid_pawn_move(from_row, from_col, to_row, to_col)
-        elif piece_type == self.board.KNIGHT:
-            is_valid = self._is_valid_knight_move(from_row, from_col, to_row, to_col)
-        elif piece_type == self.board.BISHOP:
-            is_valid = self._is_valid_bishop_move(from_row, from_col, to_row, to_col)
-        elif piece_type == self.board.ROOK:
-            is_valid = self._is_valid_rook_move(from_row, from_col, to_row, to_col)
-        elif piece_type == self.board.QUEEN:
-            is_valid = self._is_valid_queen_move(from_row, from_col, to_row, to_col)
-        elif piece_type == self.board.KING:
-            is_valid = self._is_valid_king_move(from_row, from_col, to_row, to_col)
+        # 根据棋子类型验证移动：按编码的绝对值查表调用对应的校验函数
+        piece_type = piece_code if piece_code > 0 else -piece_code
+        is_valid = self._move_validators[piece_type](from_row, from_col, to_row, to_col)
 
         # 如果基本移动合法，检查是否会导致己方王被将军
         if is_valid and check_king_safety:
@@ -81,30 +89,28 @@ class MoveValidator:
         return is_valid
 
     def _is_valid_pawn_move(self, from_row, from_col, to_row, to_col):
-        """验证兵的移动"""
-        piece = self.board.get_piece(from_row, from_col)
-        target = self.board.get_piece(to_row, to_col)
-        is_white = self.board.is_white_piece(piece)
+        """验证兵的移动（直接读取int8棋盘编码，白正黑负）"""
+        squares = self.board.squares
+        code = squares[from_row * 8 + from_col]
+        target = squares[to_row * 8 + to_col]
 
         # 白兵向上（行减小），黑兵向下（行增大）
-        direction = -1 if is_white else 1
-        start_row = 6 if is_white else 1
+        direction = -1 if code > 0 else 1
+        start_row = 6 if code > 0 else 1
 
         # 向前移动一格
         if to_col == from_col and to_row == from_row + direction:
-            return target == self.board.EMPTY
+            return target == 0
 
         # 初始位置可以向前移动两格
         if to_col == from_col and from_row == start_row and to_row == from_row + 2 * direction:
-            middle_row = from_row + direction
-            if (target == self.board.EMPTY and
-                    self.board.get_piece(middle_row, from_col) == self.board.EMPTY):
-                return True
+            return target == 0 and squares[(from_row + direction) * 8 + from_col] == 0
 
-        # 斜向吃子
-        if abs(to_col - from_col) == 1 and to_row == from_row + direction:
-            # 普通吃子
-            if target != self.board.EMPTY and self.board.is_enemy_piece(piece, target):
+        # 斜向吃子：与攻击检测共用兵的攻击表（目标格被该方兵攻击时，兵可能所在的格子）
+        attackers = PAWN_ATTACKERS['white' if code > 0 else 'black'][to_row * 8 + to_col]
+        if attackers >> (from_row * 8 + from_col) & 1:
+            # 普通吃子：目标格编码与兵异号
+            if target * code < 0:
                 return True
             # 吃过路兵
             if self.board.en_passant_target == (to_row, to_col):
@@ -114,62 +120,41 @@ class MoveValidator:
 
     def _is_valid_knight_move(self, from_row, from_col, to_row, to_col):
         """验证马的移动（日字形）"""
-        row_diff = abs(to_row - from_row)
-        col_diff = abs(to_col - from_col)
-        return (row_diff == 2 and col_diff == 1) or (row_diff == 1 and col_diff == 2)
+        return bool(KNIGHT_ATTACKS[from_row * 8 + from_col] >> (to_row * 8 + to_col) & 1)
 
     def _is_valid_bishop_move(self, from_row, from_col, to_row, to_col):
-        """验证象的移动（斜线）"""
-        row_diff = abs(to_row - from_row)
-        col_diff = abs(to_col - from_col)
-
-        # 必须是斜线移动
-        if row_diff != col_diff:
-            return False
-
-        # 检查路径是否被阻挡
-        return self._is_path_clear(from_row, from_col, to_row, to_col)
+        """验证象的移动（斜线，路径上无阻挡）"""
+        attacks = bishop_attacks(from_row * 8 + from_col, self.board.occupancy)
+        return bool(attacks >> (to_row * 8 + to_col) & 1)
 
     def _is_valid_rook_move(self, from_row, from_col, to_row, to_col):
-        """验证车的移动（直线）"""
-        # 必须是水平或垂直移动
-        if from_row != to_row and from_col != to_col:
-            return False
-
-        # 检查路径是否被阻挡
-        return self._is_path_clear(from_row, from_col, to_row, to_col)
+        """验证车的移动（直线，路径上无阻挡）"""
+        attacks = rook_attacks(from_row * 8 + from_col, self.board.occupancy)
+        return bool(attacks >> (to_row * 8 + to_col) & 1)
 
     def _is_valid_queen_move(self, from_row, from_col, to_row, to_col):
-        """验证后的移动（直线或斜线）"""
-        # 后的移动是车和象的组合
-        row_diff = abs(to_row - from_row)
-        col_diff = abs(to_col - from_col)
-
-        # 直线或斜线移动
-        if from_row == to_row or from_col == to_col or row_diff == col_diff:
-            return self._is_path_clear(from_row, from_col, to_row, to_col)
-
-        return False
+        """验证后的移动（直线或斜线，是车和象的组合）"""
+        from_sq = from_row * 8 + from_col
+        occupancy = self.board.occupancy
+        attacks = rook_attacks(from_sq, occupancy) | bishop_attacks(from_sq, occupancy)
+        return bool(attacks >> (to_row * 8 + to_col) & 1)
 
     def _is_valid_king_move(self, from_row, from_col, to_row, to_col):
         """验证王的移动"""
-        row_diff = abs(to_row - from_row)
-        col_diff = abs(to_col - from_col)
-
-        # 普通移动：一格
-        if row_diff <= 1 and col_diff <= 1:
+        # 普通移动：一格，与攻击检测共用王的攻击表
+        if KING_ATTACKS[from_row * 8 + from_col] >> (to_row * 8 + to_col) & 1:
             return True
 
         # 王车易位
-        if row_diff == 0 and col_diff == 2:
+        if to_row == from_row and abs(to_col - from_col) == 2:
             return self._is_valid_castling(from_row, from_col, to_row, to_col)
 
         return False
 
     def _is_valid_castling(self, from_row, from_col, to_row, to_col):
         """验证王车易位是否合法"""
-        piece = self.board.get_piece(from_row, from_col)
-        is_white = self.board.is_white_piece(piece)
+        squares = self.board.squares
+        is_white = squares[from_row * 8 + from_col] > 0
 
         # 检查王是否已移动
         if is_white and self.board.white_king_moved:
@@ -197,61 +182,50 @@ class MoveValidator:
             if not is_kingside and self.board.black_rook_queen_side_moved:
                 return False
 
-        # 检查车是否还在原位
-        rook = self.board.get_piece(from_row, rook_col)
-        if rook.upper() != self.board.ROOK:
+        # 检查车是否还在原位（车的编码为±4）
+        if squares[from_row * 8 + rook_col] not in (4, -4):
             return False
 
         # 检查王和车之间的路径是否畅通
-        step = 1 if is_kingside else -1
-        for col in range(from_col + step, rook_col, step):
-            if self.board.get_piece(from_row, col) != self.board.EMPTY:
-                return False
+        if BETWEEN[(from_row * 8 + from_col) * 64 + from_row * 8 + rook_col] & self.board.occupancy:
+            return False
 
         # 检查王经过的格子是否被攻击
+        step = 1 if is_kingside else -1
         for col in range(from_col, to_col + step, step):
             if self._is_square_under_attack(from_row, col, self.board.current_turn):
                 return False
 
         return True
 
-    def _is_path_clear(self, from_row, from_col, to_row, to_col):
-        """检查两点之间的路径是否畅通（不包括目标点）"""
-        row_step = 0 if from_row == to_row else (1 if to_row > from_row else -1)
-        col_step = 0 if from_col == to_col else (1 if to_col > from_col else -1)
-
-        current_row = from_row + row_step
-        current_col = from_col + col_step
-
-        while current_row != to_row or current_col != to_col:
-            if self.board.get_piece(current_row, current_col) != self.board.EMPTY:
-                return False
-            current_row += row_step
-            current_col += col_step
-
-        return True
-
     def _would_cause_check(self, from_row, from_col, to_row, to_col):
         """检查移动是否会导致己方王被将军"""
-        # 创建临时棋盘模拟移动
-        temp_board = self.board.copy()
-        piece = temp_board.get_piece(from_row, from_col)
-        target = temp_board.get_piece(to_row, to_col)
+        # 在棋盘上原地模拟移动，检查后恢复（不复制棋盘）
+        board = self.board
+        piece = board.get_piece(from_row, from_col)
+        target = board.get_piece(to_row, to_col)
+        white_king_pos = board.white_king_pos
+        black_king_pos = board.black_king_pos
 
         # 执行移动
-        temp_board.set_piece(to_row, to_col, piece)
-        temp_board.set_piece(from_row, from_col, temp_board.EMPTY)
+        board.set_piece(to_row, to_col, piece)
+        board.set_piece(from_row, from_col, board.EMPTY)
 
         # 更新王的位置
-        if piece.upper() == self.board.KING:
-            if temp_board.is_white_piece(piece):
-                temp_board.white_king_pos = (to_row, to_col)
-            else:
-                temp_board.black_king_pos = (to_row, to_col)
+        if piece == 'K':
+            board.white_king_pos = (to_row, to_col)
+        elif piece == 'k':
+            board.black_king_pos = (to_row, to_col)
 
-        # 创建临时验证器并检查
-        temp_validator = MoveValidator(temp_board)
-        return temp_validator.is_in_check(self.board.current_turn)
+        in_check = self.is_in_check(board.current_turn)
+
+        # 撤销移动
+        board.set_piece(from_row, from_col, piece)
+        board.set_piece(to_row, to_col, target)
+        board.white_king_pos = white_king_pos
+        board.black_king_pos = black_king_pos
+
+        return in_check
 
     def is_in_check(self, color):
         """检查指定颜色的王是否被将军"""
@@ -260,77 +234,158 @@ class MoveValidator:
         return self._is_square_under_attack(king_pos[0], king_pos[1], color)
 
     def _is_square_under_attack(self, row, col, defender_color):
-        """检查指定位置是否被攻击"""
-        attacker_color = 'black' if defender_color == 'white' else 'white'
-
-        # 检查所有敌方棋子是否能攻击该位置
-        for r in range(8):
-            for c in range(8):
-                piece = self.board.get_piece(r, c)
-                if piece == self.board.EMPTY:
-                    continue
-                if self.board.get_piece_color(piece) == attacker_color:
-                    # 检查该敌方棋子是否能移动到目标位置
-                    # 注意：这里不检查王的安全，避免无限递归
-                    if self._can_piece_attack(r, c, row, col):
-                        return True
-
-        return False
-
-    def _can_piece_attack(self, from_row, from_col, to_row, to_col):
-        """检查棋子是否能攻击目标位置（不考虑王的安全）"""
-        piece = self.board.get_piece(from_row, from_col)
-        piece_type = piece.upper()
-
-        if piece_type == self.board.PAWN:
-            return self._can_pawn_attack(from_row, from_col, to_row, to_col)
-        elif piece_type == self.board.KNIGHT:
-            return self._is_valid_knight_move(from_row, from_col, to_row, to_col)
-        elif piece_type == self.board.BISHOP:
-            return self._is_valid_bishop_move(from_row, from_col, to_row, to_col)
-        elif piece_type == self.board.ROOK:
-            return self._is_valid_rook_move(from_row, from_col, to_row, to_col)
-        elif piece_type == self.board.QUEEN:
-            return self._is_valid_queen_move(from_row, from_col, to_row, to_col)
-        elif piece_type == self.board.KING:
-            row_diff = abs(to_row - from_row)
-            col_diff = abs(to_col - from_col)
-            return row_diff <= 1 and col_diff <= 1
+        """
+        检查指定位置是否被攻击
 
-        return False
+        用位棋盘查表：马、王、兵的攻击范围与对应敌方棋子的位棋盘求交；
+        滑动棋子反过来从目标格按车/象的走法求攻击范围，与敌方车/象/后的位棋盘求交
+        """
+        attacker_color = 'black' if defender_color == 'white' else 'white'
+        sign = 1 if attacker_color == 'white' else -1
+        square = row * 8 + col
+        bitboards = self.board.bitboards
 
-    def _can_pawn_attack(self, from_row, from_col, to_row, to_col):
-        """检查兵是否能攻击目标位置"""
-        piece = self.board.get_piece(from_row, from_col)
-        is_white = self.board.is_white_piece(piece)
-        direction = -1 if is_white else 1
+        if KNIGHT_ATTACKS[square] & bitboards[2 * sign]:
+            return True
+        if KING_ATTACKS[square] & bitboards[6 * sign]:
+            return True
+        if PAWN_ATTACKERS[attacker_color][square] & bitboards[sign]:
+            return True
 
-        # 兵只能斜向攻击
-        if abs(to_col - from_col) == 1 and to_row == from_row + direction:
+        queens = bitboards[5 * sign]
+        occupancy = self.board.occupancy
+        if rook_attacks(square, occupancy) & (bitboards[4 * sign] | queens):
+            return True
+        if bishop_attacks(square, occupancy) & (bitboards[3 * sign] | queens):
             return True
 
         return False
 
     def get_all_legal_moves(self, color):
         """获取指定颜色的所有合法移动"""
-        legal_moves = []
-
-        for from_row in range(8):
-            for from_col in range(8):
-                piece = self.board.get_piece(from_row, from_col)
-                if piece == self.board.EMPTY:
-                    continue
-                if self.board.get_piece_color(piece) != color:
-                    continue
-
-                # 尝试所有可能的目标位置
-                for to_row in range(8):
-                    for to_col in range(8):
-                        if self.is_valid_move(from_row, from_col, to_row, to_col):
-                            legal_moves.append(((from_row, from_col), (to_row, to_col)))
+        cache = self._legal_moves_cache
+        cache_key = (self.board.zobrist_key(), self.board.en_passant_target, color)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            cache.move_to_end(cache_key)
+            return list(cached)
+
+        legal_moves = list(self._generate_legal_moves(color))
+
+        cache[cache_key] = tuple(legal_moves)
+        if len(cache) > self.LEGAL_MOVES_CACHE_SIZE:
+            cache.popitem(last=False)
 
         return legal_moves
 
+    def iter_legal_moves(self, color):
+        """
+        逐个产生指定颜色的合法移动（顺序与get_all_legal_moves相同）
+
+        缓存命中时直接遍历缓存，否则边生成边返回，调用方拿到需要的移动后即可停止；
+        未完整遍历的结果不写入缓存。未命中缓存时，每个移动在产生前都会在self.board上
+        原地试走并恢复以检查王的安全，因此在生成器耗尽或被关闭之前，调用方不能在棋盘上执行移动
+
+        Returns:
+            迭代器: ((from_row, from_col), (to_row, to_col))
+        """
+        cached = self._legal_moves_cache.get((self.board.zobrist_key(), self.board.en_passant_target, color))
+        if cached is not None:
+            return iter(cached)
+        return self._generate_legal_moves(color)
+
+    def has_any_legal_move(self, color):
+        """指定颜色是否至少有一个合法移动（找到第一个即返回）"""
+        return next(self.iter_legal_moves(color), None) is not None
+
+    def _generate_legal_moves(self, color):
+        """按起始格、目标格下标升序生成合法移动（不查缓存）"""
+        squares = self.board.squares
+        sign = 1 if color == 'white' else -1
+
+        # 只遍历该方棋子所在的格子；is_valid_move会原地试走修改集合，因此先排序拷贝，
+        # 同时保持按格子下标升序的走法顺序
+        for from_sq in sorted(self.board.piece_squares[color]):
+            piece_code = squares[from_sq] * sign
+            from_row, from_col = divmod(from_sq, 8)
+
+            # 只尝试该棋子可能到达的目标格，再由is_valid_move做完整校验
+            for to_sq in self._candidate_squares(from_sq, piece_code, sign):
+                if self.is_valid_move(from_row, from_col, to_sq // 8, to_sq % 8):
+                    yield _MOVES[from_sq * 64 + to_sq]
+
+    def generate_moves_from(self, row, col):
+        """
+        按棋子类型生成指定位置棋子的候选目标格（几何上可达，尚未校验规则和王的安全）
+
+        Args:
+            row: 行
+            col: 列
+
+        Returns:
+            list: [(to_row, to_col), ...]，按格子下标升序；空格返回空列表
+        """
+        from_sq = row * 8 + col
+        code = self.board.squares[from_sq]
+        if code == 0:
+            return []
+        sign = 1 if code > 0 else -1
+        return [divmod(to_sq, 8) for to_sq in self._candidate_squares(from_sq, code * sign, sign)]
+
+    def _candidate_squares(self, from_sq, piece_code, sign):
+        """
+        获取棋子的候选目标格（按升序，是合法目标格的超集）
+
+        Args:
+            from_sq: 起始格下标 row * 8 + col
+            piece_code: 棋子类型编码（1=兵 2=马 3=象 4=车 5=后 6=王）
+            sign: 白方为1，黑方为-1
+
+        Returns:
+            序列: 候选目标格下标
+        """
+        if piece_code == 2:
+            return KNIGHT_MOVES[from_sq]
+
+        row, col = divmod(from_sq, 8)
+
+        if piece_code == 6:
+            # 王车易位的目标格由_is_valid_castling校验
+            targets = list(KING_MOVES[from_sq])
+            if col >= 2:
+                targets.append(from_sq - 2)
+            if col <= 5:
+                targets.append(from_sq + 2)
+            return sorted(targets)
+
+        if piece_code == 1:
+            # 白兵向上（行减小），黑兵向下（行增大）：前进一格、两格和两个斜向
+            direction = -sign
+            targets = []
+            for step in (1, 2):
+                to_row = row + direction * step
+                if 0 <= to_row < 8:
+                    targets.append(to_row * 8 + col)
+            to_row = row + direction
+            if 0 <= to_row < 8:
+                if col > 0:
+                    targets.append(to_row * 8 + col - 1)
+                if col < 7:
+                    targets.append(to_row * 8 + col + 1)
+            return sorted(targets)
+
+        # 滑动棋子沿射线前进，遇到第一个棋子（可能可以吃掉）为止
+        squares = self.board.squares
+        rays = RAY_SQUARES[from_sq]
+        directions = BISHOP_RAYS if piece_code == 3 else ROOK_RAYS if piece_code == 4 else QUEEN_RAYS
+        targets = []
+        for direction in directions:
+            for to_sq in rays[direction]:
+                targets.append(to_sq)
+                if squares[to_sq]:
+                    break
+        return sorted(targets)
+
     def is_checkmate(self, color):
         """检查是否将死"""
         # 必须先处于被将军状态
@@ -338,7 +393,7 @@ class MoveValidator:
             return False
 
         # 检查是否有任何合法移动可以解除将军
-        return len(self.get_all_legal_moves(color)) == 0
+        return not self.has_any_legal_move(color)
 
     def is_stalemate(self, color):
         """检查是否僵局（无子可动但未被将军）"""
@@ -347,4 +402,4 @@ class MoveValidator:
             return False
 
         # 检查是否有任何合法移动
-        return len(self.get_all_legal_moves(color)) == 0
+        return not self.has_any_legal_move(color)
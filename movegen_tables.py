@@ -0,0 +1,141 @@
+"""
+走法生成预计算表
+导入时为每个格子（下标为 row * 8 + col）预先计算马、王的目标格和滑动棋子的射线，
+生成走法时直接查表，不再逐个尝试位移并检查边界；
+同样的表也以位棋盘掩码（第square位为1）的形式提供，用于攻击检测
+"""
+
+# 马和王的位移
+KNIGHT_DELTAS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+KING_DELTAS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+# 射线方向：0-3为直线（车），4-7为斜线（象），后使用全部8个方向
+RAY_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+ROOK_RAYS = (0, 1, 2, 3)
+BISHOP_RAYS = (4, 5, 6, 7)
+QUEEN_RAYS = (0, 1, 2, 3, 4, 5, 6, 7)
+
+# 中心格子d4, e4, d5, e5和扩展中心c3-f6（评估中心控制用）
+CENTER_SQUARES = (27, 28, 35, 36)
+EXTENDED_CENTER_SQUARES = (18, 19, 20, 21, 26, 29, 34, 37, 42, 43, 44, 45)
+
+
+def _step_targets(deltas):
+    """每个格子按给定位移一步可到达的格子（升序）"""
+    tables = []
+    for square in range(64):
+        row, col = divmod(square, 8)
+        targets = [(row + dr) * 8 + (col + dc) for dr, dc in deltas
+                   if 0 <= row + dr < 8 and 0 <= col + dc < 8]
+        tables.append(tuple(sorted(targets)))
+    return tuple(tables)
+
+
+def _ray_squares():
+    """每个格子在8个方向上由近到远经过的格子"""
+    tables = []
+    for square in range(64):
+        row, col = divmod(square, 8)
+        rays = []
+        for dr, dc in RAY_DIRECTIONS:
+            ray = []
+            r, c = row + dr, col + dc
+            while 0 <= r < 8 and 0 <= c < 8:
+                ray.append(r * 8 + c)
+                r += dr
+                c += dc
+            rays.append(tuple(ray))
+        tables.append(tuple(rays))
+    return tuple(tables)
+
+
+KNIGHT_MOVES = _step_targets(KNIGHT_DELTAS)
+KING_MOVES = _step_targets(KING_DELTAS)
+RAY_SQUARES = _ray_squares()
+
+
+def square_mask(squares):
+    """格子下标集合 -> 位棋盘掩码"""
+    mask = 0
+    for square in squares:
+        mask |= 1 << square
+    return mask
+
+
+def _pawn_attackers(row_offset):
+    """每个格子被某一方的兵攻击时，该兵可能所在的格子（掩码）"""
+    masks = []
+    for square in range(64):
+        row, col = divmod(square, 8)
+        attackers = [(row + row_offset) * 8 + (col + dc) for dc in (-1, 1)
+                     if 0 <= row + row_offset < 8 and 0 <= col + dc < 8]
+        masks.append(square_mask(attackers))
+    return tuple(masks)
+
+
+KNIGHT_ATTACKS = tuple(square_mask(targets) for targets in KNIGHT_MOVES)
+KING_ATTACKS = tuple(square_mask(targets) for targets in KING_MOVES)
+
+# 白兵向上（行减小）攻击，因此攻击某格的白兵位于下一行；黑兵相反
+PAWN_ATTACKERS = {'white': _pawn_attackers(1), 'black': _pawn_attackers(-1)}
+
+
+def _between():
+    """两格之间（不含两端）的格子掩码，按 from_sq * 64 + to_sq 索引；两格不在同一直线或斜线上时为0"""
+    table = [0] * 4096
+    for square in range(64):
+        for ray in RAY_SQUARES[square]:
+            for i, target in enumerate(ray):
+                table[square * 64 + target] = square_mask(ray[:i])
+    return tuple(table)
+
+
+# 判断路径是否畅通只需 BETWEEN[from_sq * 64 + to_sq] & occupancy == 0
+BETWEEN = _between()
+
+
+def _slider_attacks(square, occupancy, directions):
+    """沿给定方向逐格前进得到的攻击范围（包含每个方向上遇到的第一个棋子）"""
+    attacks = 0
+    rays = RAY_SQUARES[square]
+    for direction in directions:
+        for target in rays[direction]:
+            attacks |= 1 << target
+            if occupancy >> target & 1:
+                break
+    return attacks
+
+
+def _relevant_occupancy(directions):
+    """每个格子在给定方向上会影响攻击范围的格子：射线上除最后一格（棋盘边缘）外的格子"""
+    return tuple(square_mask(target for direction in directions for target in RAY_SQUARES[square][direction][:-1])
+                 for square in range(64))
+
+
+# 滑动棋子攻击表（magic bitboard的Python版本）：只有射线上相关格子的占据情况
+# (occupancy & mask) 决定攻击范围，用它作为字典键代替magic乘法和移位得到的下标。
+# 全部展开约10万项，导入时计算太慢，因此在首次遇到某种占据情况时计算并记住
+ROOK_OCCUPANCY_MASKS = _relevant_occupancy(ROOK_RAYS)
+BISHOP_OCCUPANCY_MASKS = _relevant_occupancy(BISHOP_RAYS)
+_ROOK_ATTACK_TABLES = tuple({} for _ in range(64))
+_BISHOP_ATTACK_TABLES = tuple({} for _ in range(64))
+
+
+def rook_attacks(square, occupancy):
+    """车在square上、棋盘占据为occupancy时的攻击范围（位棋盘）"""
+    key = occupancy & ROOK_OCCUPANCY_MASKS[square]
+    table = _ROOK_ATTACK_TABLES[square]
+    attacks = table.get(key)
+    if attacks is None:
+        attacks = table[key] = _slider_attacks(square, key, ROOK_RAYS)
+    return attacks
+
+
+def bishop_attacks(square, occupancy):
+    """象在square上、棋盘占据为occupancy时的攻击范围（位棋盘）"""
+    key = occupancy & BISHOP_OCCUPANCY_MASKS[square]
+    table = _BISHOP_ATTACK_TABLES[square]
+    attacks = table.get(key)
+    if attacks is None:
+        attacks = table[key] = _slider_attacks(square, key, BISHOP_RAYS)
+    return attacks
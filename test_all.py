@@ -2,10 +2,12 @@
 功能测试脚本
 验证国际象棋程序的所有核心功能
 """
-from chess_board import ChessBoard
+import random
+from chess_board import ChessBoard, square_name
 from move_validator import MoveValidator
 from game_manager import GameManager
 from chess_ai import ChessAI
+from ai_self_play import AISelfPlay
 
 
 def test_board():
@@ -16,6 +18,14 @@ def test_board():
     board = ChessBoard()
     print(board)
     print(f"FEN: {board.to_fen()}")
+
+    # 按位棋盘统计各方棋子数量
+    for color in ('white', 'black'):
+        counts = [board.count(piece_type, color) for piece_type in 'PNBRQK']
+        assert counts == [8, 2, 2, 2, 1, 1], (color, counts)
+    board.set_piece(6, 4, board.EMPTY)
+    assert board.count('P', 'white') == 7 and board.count('P', 'black') == 8
+    board.set_piece(6, 4, 'P')
     print("[OK] 棋盘初始化成功")
     print()
     return board
@@ -68,6 +78,20 @@ def test_check_detection():
 
     is_check = validator.is_in_check('white')
     print(f"白王被将军: {is_check}")
+
+    # 愚者将杀：1.f3 e5 2.g4 Qh4#
+    mate = GameManager()
+    for move in [(6, 5, 5, 5), (1, 4, 3, 4), (6, 6, 4, 6), (0, 3, 4, 7)]:
+        assert mate.make_move(*move)
+    mate_validator = MoveValidator(mate.board)
+    assert mate_validator.is_checkmate('white')
+    assert not mate_validator.has_any_legal_move('white')
+    assert mate.get_game_status()['result'] == 'checkmate'
+
+    # 静态搜索到达被将死的局面时按将死计分，而不是当作平静局面
+    ai = ChessAI(mate.board, color='white')
+    assert ai._quiesce(mate.board, -ai.MATE_SCORE, ai.MATE_SCORE) == -ai.MATE_SCORE
+    print("愚者将杀判定为将死")
     print("[OK] 将军检测功能正常")
     print()
 
@@ -96,8 +120,8 @@ def test_ai():
         from_row, from_col = from_pos
         to_row, to_col = to_pos
 
-        from_notation = chr(ord('a') + from_col) + str(8 - from_row)
-        to_notation = chr(ord('a') + to_col) + str(8 - to_row)
+        from_notation = square_name(from_row, from_col)
+        to_notation = square_name(to_row, to_col)
 
         print(f"AI选择移动: {from_notation} -> {to_notation}")
         print(f"评估节点数: {ai.nodes_evaluated}")
@@ -107,6 +131,10 @@ def test_ai():
         print(game.board)
         print()
 
+    # 置换表条目的深度超出6位字段时截断存放，不能破坏标志位和评分
+    depth, flag, value, move = ai._tt_unpack(ai._tt_pack(64, ai.TT_EXACT, 5, None))
+    assert (depth, flag, value, move) == (ai.TT_MAX_DEPTH, ai.TT_EXACT, 5, None)
+
     print("[OK] AI功能正常")
     print()
 
@@ -139,6 +167,231 @@ def test_special_moves():
     print()
 
 
+def test_zobrist_hash():
+    """测试Zobrist哈希"""
+    print("=" * 50)
+    print("测试6: Zobrist哈希")
+    print("=" * 50)
+
+    # 不同走子顺序到达同一局面，哈希应相同
+    game1 = GameManager()
+    for move in [(7, 6, 5, 5), (0, 6, 2, 5), (7, 1, 5, 2)]:
+        game1.make_move(*move)
+    game2 = GameManager()
+    for move in [(7, 1, 5, 2), (0, 6, 2, 5), (7, 6, 5, 5)]:
+        game2.make_move(*move)
+
+    print(f"局面1哈希: {game1.board.zobrist_key():016x}")
+    print(f"局面2哈希: {game2.board.zobrist_key():016x}")
+    assert game1.board.zobrist_key() == game2.board.zobrist_key()
+
+    # 增量更新的哈希应与从头计算的结果一致
+    assert game1.board.zobrist_hash == game1.board._compute_zobrist_hash()
+
+    # 行棋方不同，哈希应不同
+    game1.board.switch_turn()
+    assert game1.board.zobrist_key() != game2.board.zobrist_key()
+
+    print("[OK] Zobrist哈希功能正常")
+    print()
+
+
+def test_make_unmake():
+    """测试原地执行/撤销移动"""
+    print("=" * 50)
+    print("测试7: 原地执行/撤销移动")
+    print("=" * 50)
+
+    # 白方可以王车易位的局面
+    board = ChessBoard()
+    for move in [((6, 4), (4, 4)), ((1, 0), (2, 0)), ((7, 6), (5, 5)), ((2, 0), (3, 0)),
+                 ((7, 5), (6, 4)), ((3, 0), (4, 0)), ((6, 1), (4, 1))]:
+        board.make_move(move)
+    validator = MoveValidator(board)
+    key = board.zobrist_key()
+
+    # 双方的每个合法移动执行后哈希一致，撤销后局面完全恢复
+    for color in ('white', 'black'):
+        board.current_turn = color
+        fen = board.to_fen()
+        for move in validator.get_all_legal_moves(color):
+            undo = board.make_move(move)
+            assert board.zobrist_hash == board._compute_zobrist_hash()
+            assert board.piece_squares == board._collect_piece_squares()
+            assert (board.bitboards, board.occupancy) == board._collect_bitboards()
+            board.unmake_move(move, undo)
+            assert board.to_fen() == fen
+
+    # 王车易位同时移动车，撤销后易位权恢复
+    board.current_turn = 'white'
+    undo = board.make_move(((7, 4), (7, 6)))
+    assert board.get_piece(7, 5) == 'R' and board.white_king_pos == (7, 6)
+    board.unmake_move(((7, 4), (7, 6)), undo)
+    assert board.get_piece(7, 7) == 'R' and not board.white_king_moved
+    board.current_turn = 'black'
+    assert board.zobrist_key() == key
+
+    print("[OK] 原地执行/撤销移动功能正常")
+    print()
+
+
+def test_piece_moves():
+    """测试单个棋子的合法移动生成"""
+    print("=" * 50)
+    print("测试8: 单个棋子的合法移动")
+    print("=" * 50)
+
+    def check_position(game):
+        """当前行棋方每个棋子的合法移动都与全部合法移动中该棋子的部分、以及逐格校验64个目标格的结果一致"""
+        board = game.board
+        color = board.current_turn
+        all_moves = game.validator.get_all_legal_moves(color)
+        for row in range(8):
+            for col in range(8):
+                piece = board.get_piece(row, col)
+                if board.get_piece_color(piece) != color:
+                    continue
+                expected = [to_pos for from_pos, to_pos in all_moves if from_pos == (row, col)]
+                brute_force = [(to_row, to_col) for to_row in range(8) for to_col in range(8)
+                               if game.validator.is_valid_move(row, col, to_row, to_col)]
+                moves = game.get_legal_moves_for_piece(row, col)
+                assert sorted(moves) == sorted(expected) == brute_force, (board.to_fen(), row, col)
+
+    def play(moves):
+        game = GameManager()
+        for move in moves:
+            assert game.make_move(*move)
+        return game
+
+    # 开局局面
+    check_position(GameManager())
+
+    # 王车易位：1.e4 e5 2.Nf3 Nc6 3.Bc4 Bc5，白方可短易位
+    game = play([(6, 4, 4, 4), (1, 4, 3, 4), (7, 6, 5, 5), (0, 1, 2, 2), (7, 5, 4, 2), (0, 5, 3, 2)])
+    assert (7, 6) in game.get_legal_moves_for_piece(7, 4)
+    check_position(game)
+
+    # 吃过路兵：1.e4 a6 2.e5 d5，白兵可exd6
+    game = play([(6, 4, 4, 4), (1, 0, 2, 0), (4, 4, 3, 4), (1, 3, 3, 3)])
+    assert (2, 3) in game.get_legal_moves_for_piece(3, 4)
+    check_position(game)
+
+    # 兵升变：白兵在a7，a8空、b8有黑马，可直进或吃子升变
+    game = GameManager()
+    game.board.set_piece(1, 0, 'P')
+    game.board.set_piece(0, 0, '.')
+    assert sorted(game.get_legal_moves_for_piece(1, 0)) == [(0, 0), (0, 1)]
+    check_position(game)
+
+    # 随机对局中的局面
+    rng = random.Random(3)
+    for _ in range(3):
+        game = GameManager()
+        for _ in range(40):
+            check_position(game)
+            moves = game.validator.get_all_legal_moves(game.board.current_turn)
+            if not moves or game.game_over:
+                break
+            (from_row, from_col), (to_row, to_col) = rng.choice(moves)
+            game.make_move(from_row, from_col, to_row, to_col)
+
+    print("[OK] 单个棋子的合法移动功能正常")
+    print()
+
+
+def test_legal_moves_cache():
+    """测试合法移动缓存"""
+    print("=" * 50)
+    print("测试9: 合法移动缓存")
+    print("=" * 50)
+
+    board = ChessBoard()
+    validator = MoveValidator(board)
+
+    # 命中缓存时返回相同的移动，不新增条目
+    moves = validator.get_all_legal_moves('white')
+    assert validator.get_all_legal_moves('white') == moves
+    assert len(validator._legal_moves_cache) == 1
+
+    # 缓存属于验证器：新建对局不影响已有验证器的缓存
+    GameManager()
+    assert len(validator._legal_moves_cache) == 1
+
+    # 随机走子再逐步撤销，每个局面取到的缓存结果都与重新生成的一致
+    rng = random.Random(7)
+    undo_stack = []
+    for _ in range(60):
+        color = board.current_turn
+        moves = validator.get_all_legal_moves(color)
+        assert moves == list(validator._generate_legal_moves(color))
+        if not moves:
+            break
+        move = rng.choice(moves)
+        undo_stack.append((move, board.make_move(move)))
+    while undo_stack:
+        move, undo = undo_stack.pop()
+        board.unmake_move(move, undo)
+        color = board.current_turn
+        assert validator.get_all_legal_moves(color) == list(validator._generate_legal_moves(color))
+
+    # 直接修改易位标志后不能再取到旧局面的缓存（易位权是键的一部分）
+    board = ChessBoard()
+    for move in [((6, 4), (4, 4)), ((1, 0), (2, 0)), ((7, 6), (5, 5)), ((2, 0), (3, 0)),
+                 ((7, 5), (6, 4)), ((3, 0), (4, 0))]:
+        board.make_move(move)
+    validator = MoveValidator(board)
+    castle = ((7, 4), (7, 6))
+    assert castle in validator.get_all_legal_moves('white')
+    board.white_king_moved = True
+    assert castle not in validator.get_all_legal_moves('white')
+    board.white_king_moved = False
+    assert castle in validator.get_all_legal_moves('white')
+
+    # 超出容量时淘汰最久未使用的局面；再次取用的局面移到最近使用的一端
+    board = ChessBoard()
+    validator = MoveValidator(board)
+    validator.LEGAL_MOVES_CACHE_SIZE = 3
+    cache = validator._legal_moves_cache
+    keys = []
+    undo_stack = []
+    for move in [((6, 4), (4, 4)), ((1, 4), (3, 4)), ((7, 6), (5, 5))]:
+        validator.get_all_legal_moves(board.current_turn)
+        keys.append((board.zobrist_key(), board.en_passant_target, board.current_turn))
+        undo_stack.append((move, board.make_move(move)))
+    assert len(cache) == 3
+    for move, undo in reversed(undo_stack):
+        board.unmake_move(move, undo)
+    validator.get_all_legal_moves('white')  # 再次取用初始局面
+    for move, undo in undo_stack:
+        board.make_move(move)
+    validator.get_all_legal_moves(board.current_turn)  # 第四个局面，淘汰keys[1]
+    assert len(cache) == 3
+    assert keys[0] in cache and keys[1] not in cache and keys[2] in cache
+
+    print("[OK] 合法移动缓存功能正常")
+    print()
+
+
+def test_parallel_search():
+    """测试根节点并行搜索"""
+    print("=" * 50)
+    print("测试10: 根节点并行搜索")
+    print("=" * 50)
+
+    self_play = AISelfPlay(white_depth=2, black_depth=2, display_board=False, delay=0, benchmark=True, jobs=2)
+    game = self_play.game_manager
+    game.make_move(6, 4, 4, 4)  # e2-e4
+    try:
+        best_move = self_play._parallel_best_move(self_play.black_ai)
+    finally:
+        self_play._shutdown_pool()
+    assert best_move in game.validator.get_all_legal_moves('black')
+    print(f"并行搜索选择移动: {square_name(*best_move[0])} -> {square_name(*best_move[1])}")
+
+    print("[OK] 根节点并行搜索功能正常")
+    print()
+
+
 def main():
     """主测试函数"""
     print("\n")
@@ -153,6 +406,11 @@ def main():
         test_check_detection()
         test_ai()
         test_special_moves()
+        test_zobrist_hash()
+        test_make_unmake()
+        test_piece_moves()
+        test_legal_moves_cache()
+        test_parallel_search()
 
         print("=" * 50)
         print("所有测试通过！[OK]")
@@ -3,6 +3,7 @@ GPU加速测试脚本
 测试GPU加速AI的功能和性能
 """
 import time
+import numpy as np
 from chess_board import ChessBoard
 from chess_ai import ChessAI
 from chess_ai_gpu import ChessAIGPU
@@ -88,6 +89,32 @@ def test_ai_move():
 
     return cpu_time, gpu_time
 
+def test_evaluate_batch():
+    """测试批量评估与逐个评估结果一致"""
+    print("\n" + "=" * 60)
+    print("测试4: 批量评估")
+    print("=" * 60)
+
+    board = ChessBoard()
+    gpu_ai = ChessAIGPU(board, color='white', max_depth=3, use_gpu=True)
+    cpu_ai = ChessAI(board, color='white', max_depth=3)
+
+    # 构造若干子局面：初始局面、白方走e4、白后被吃掉
+    boards = [board.copy() for _ in range(3)]
+    boards[1].set_piece(4, 4, 'P')
+    boards[1].set_piece(6, 4, '.')
+    boards[2].set_piece(7, 3, '.')
+
+    batch = np.stack([np.frombuffer(b.squares, dtype=np.int8) for b in boards])
+    scores = gpu_ai.evaluate_batch(gpu_ai.xp.asarray(batch))
+    if gpu_ai.use_gpu:
+        scores = scores.get()
+
+    for b, score in zip(boards, scores):
+        material, psqt = cpu_ai._evaluate_material(b)
+        assert score == material + psqt, f"批量评估结果不一致: {score} != {material + psqt}"
+    print(f"[OK] 批量评估正确: {list(scores)}")
+
 if __name__ == "__main__":
     print("国际象棋AI GPU加速测试")
     print()
@@ -101,6 +128,9 @@ if __name__ == "__main__":
     # 测试3: AI移动计算
     test_ai_move()
 
+    # 测试4: 批量评估
+    test_evaluate_batch()
+
     print("\n" + "=" * 60)
     print("所有测试完成！")
     print("=" * 60)
@@ -5,6 +5,32 @@ Pygame图形界面模块
 import pygame
 import sys
 import os
+import queue
+import threading
+
+
+# 已找到的字体来源（'chess' / 'chinese' -> 来源），同一进程中之后创建的PygameUI直接复用，
+# 不再逐个尝试系统字体；字体对象与字号有关，因此只记住名称或路径
+_resolved_fonts = {}
+
+
+def _make_font(source, size):
+    """
+    按字体来源创建字体对象
+
+    Args:
+        source: ('sysfont', 字体名)、('file', 字体文件路径) 或 ('default', None)
+        size: 字体大小
+
+    Returns:
+        pygame.font.Font: 字体对象
+    """
+    kind, name = source
+    if kind == 'sysfont':
+        return pygame.font.SysFont(name, size)
+    if kind == 'file':
+        return pygame.font.Font(name, size)
+    return pygame.font.Font(None, size)
 
 
 class PygameUI:
@@ -19,6 +45,11 @@ class PygameUI:
     BUTTON_COLOR = (100, 150, 200)
     BUTTON_HOVER = (120, 170, 220)
 
+    # 空闲时等待事件的超时（毫秒）：没有输入时进程休眠，超时只作为兜底唤醒
+    IDLE_WAIT_MS = 500
+    # AI思考期间等待事件的超时（毫秒），到时检查搜索线程是否已给出结果
+    AI_POLL_MS = 50
+
     # 棋子Unicode字符（用于支持Unicode的字体）
     PIECE_SYMBOLS_UNICODE = {
         'K': '♔', 'Q': '♕', 'R': '♖', 'B': '♗', 'N': '♘', 'P': '♙',
@@ -50,26 +81,93 @@ class PygameUI:
         self.board_offset_x = (width - self.board_size) // 2
         self.board_offset_y = 50
 
+        # 每列/每行方格左上角和中心的像素坐标，绘制时直接查表
+        self._col_x = tuple(self.board_offset_x + col * self.square_size for col in range(8))
+        self._row_y = tuple(self.board_offset_y + row * self.square_size for row in range(8))
+        self._center_x = tuple(x + self.square_size // 2 for x in self._col_x)
+        self._center_y = tuple(y + self.square_size // 2 for y in self._row_y)
+
+        # 64个方格按行优先展开为 (row, col, x, y, 中心x, 中心y)，绘制时用单层循环遍历
+        self._squares = tuple((row, col, self._col_x[col], self._row_y[row], self._center_x[col], self._center_y[row])
+                              for row in range(8) for col in range(8))
+
         # 创建窗口
         self.screen = pygame.display.set_mode((width, height))
         pygame.display.set_caption("国际象棋")
 
-        # 字体 - 尝试使用支持Unicode chess符号的字体
-        self.piece_font = self._load_chess_font(int(self.square_size * 0.7))
+        # 字体 - 尝试使用支持Unicode chess符号的字体，同时得到是否使用Unicode棋子符号
+        self.piece_font, self.use_unicode = self._load_chess_font(int(self.square_size * 0.7))
 
         # 加载支持中文的字体
         self.info_font = self._load_chinese_font(32)
         self.small_font = self._load_chinese_font(24)
 
-        # 是否使用Unicode棋子符号
-        self.use_unicode = self._test_unicode_support()
+        # 四种方格颜色各预先填充一个方格大小的Surface，绘制棋盘时批量blit
+        self._square_surfaces = {}
+        for color in (self.WHITE, self.BLACK, self.HIGHLIGHT, self.CHECK_HIGHLIGHT):
+            surface = pygame.Surface((self.square_size, self.square_size)).convert()
+            surface.fill(color)
+            self._square_surfaces[color] = surface
+
+        # 不带任何高亮时64个方格的 (Surface, 位置)，按 row * 8 + col 排列
+        self._plain_square_blits = [
+            (self._square_surfaces[self.WHITE if (row + col) % 2 == 0 else self.BLACK], (x, y))
+            for row, col, x, y, _, _ in self._squares
+        ]
+
+        # 棋子和坐标标记只渲染一次，每帧直接blit缓存的Surface；
+        # 坐标标记的位置也是固定的，直接保存为 (Surface, Rect) 列表
+        self._piece_surfaces = self._render_piece_surfaces()
+        self._label_blits = []
+        for i in range(8):
+            # 列标记 (a-h)
+            label = self.small_font.render(chr(ord('a') + i), True, self.TEXT_COLOR).convert_alpha()
+            center = (self._center_x[i], self.board_offset_y + self.board_size + 5)
+            self._label_blits.append((label, label.get_rect(center=center)))
+
+            # 行标记 (1-8)
+            label = self.small_font.render(str(8 - i), True, self.TEXT_COLOR).convert_alpha()
+            center = (self.board_offset_x - 15, self._center_y[i])
+            self._label_blits.append((label, label.get_rect(center=center)))
+
+        # 信息面板中不变的文字预先渲染；移动次数只在数值变化时重新渲染
+        self._turn_surfaces = {
+            'white': self.info_font.render("当前回合: 白方", True, self.TEXT_COLOR).convert_alpha(),
+            'black': self.info_font.render("当前回合: 黑方", True, self.TEXT_COLOR).convert_alpha(),
+        }
+        self._check_surface = self.info_font.render("将军!", True, (255, 0, 0)).convert_alpha()
+        self._move_count = None
+        self._move_count_surface = None
+
+        # 半透明遮罩（游戏结束、升变对话框）按透明度缓存，首次使用时创建，之后直接blit
+        self._overlays = {}
+
+        # AI思考提示的文字和背景不变，预先渲染
+        self._ai_thinking_text = self.info_font.render("AI思考中...", True, (100, 100, 255)).convert_alpha()
+        text_rect = self._ai_thinking_text.get_rect(center=(self.width // 2, self.height // 2))
+        bg = pygame.Surface((text_rect.width + 40, text_rect.height + 20)).convert()
+        bg.fill((255, 255, 255))
+        bg.set_alpha(200)
+        self._ai_thinking_blits = [
+            (bg, bg.get_rect(center=(self.width // 2, self.height // 2))),
+            (self._ai_thinking_text, text_rect),
+        ]
 
         # 选中状态
         self.selected_piece = None  # (row, col)
-        self.legal_moves = []
+        self.legal_moves = frozenset()  # 选中棋子的合法目标格集合
 
-        # AI思考状态
+        # AI思考状态：搜索在后台线程中进行，结果通过队列交回主循环
         self.ai_thinking = False
+        self._ai_queue = queue.Queue()
+
+        # 界面需要重绘（点击、移动、AI状态变化、窗口重新显示时置位），否则跳过绘制和flip
+        self._dirty = True
+
+        # 棋盘、棋子和信息面板画好后保存在_scene中；只有它们变化（点击、移动）时才重新绘制，
+        # 只是遮罩变化（如开始AI思考）或窗口重新显示时直接blit保存的画面
+        self._scene = pygame.Surface((width, height)).convert()
+        self._scene_dirty = True
 
     def _load_chess_font(self, size):
         """
@@ -79,7 +177,23 @@ class PygameUI:
             size: 字体大小
 
         Returns:
-            pygame.font.Font: 字体对象
+            tuple: (pygame.font.Font, 是否支持Unicode chess符号)
+        """
+        resolved = _resolved_fonts.get('chess')
+        if resolved is None:
+            resolved = _resolved_fonts['chess'] = self._find_chess_font(size)
+        source, supports_unicode = resolved
+        return _make_font(source, size), supports_unicode
+
+    def _find_chess_font(self, size):
+        """
+        查找支持国际象棋Unicode字符的字体
+
+        Args:
+            size: 测试用的字体大小
+
+        Returns:
+            tuple: (字体来源（见_make_font）, 是否支持Unicode chess符号)
         """
         # 尝试加载支持Unicode chess符号的系统字体
         font_names = [
@@ -97,13 +211,19 @@ class PygameUI:
                 test_surface = font.render('♔', True, (0, 0, 0))
                 if test_surface.get_width() > 0:
                     print(f"使用棋子字体: {font_name}")
-                    return font
+                    # 渲染宽度太小说明实际不支持
+                    return ('sysfont', font_name), test_surface.get_width() > 5
             except:
                 continue
 
         # 如果都失败，使用默认字体（将使用ASCII显示）
         print("未找到支持Unicode chess符号的字体，将使用ASCII字符显示棋子")
-        return pygame.font.Font(None, size)
+        source = ('default', None)
+        try:
+            supports_unicode = _make_font(source, size).render('♔', True, (0, 0, 0)).get_width() > 5
+        except:
+            supports_unicode = False
+        return source, supports_unicode
 
     def _load_chinese_font(self, size):
         """
@@ -115,6 +235,21 @@ class PygameUI:
         Returns:
             pygame.font.Font: 字体对象
         """
+        source = _resolved_fonts.get('chinese')
+        if source is None:
+            source = _resolved_fonts['chinese'] = self._find_chinese_font(size)
+        return _make_font(source, size)
+
+    def _find_chinese_font(self, size):
+        """
+        查找支持中文的字体
+
+        Args:
+            size: 测试用的字体大小
+
+        Returns:
+            tuple: 字体来源，见_make_font
+        """
         # 尝试加载支持中文的系统字体（使用英文和中文名称）
         font_names = [
             'microsoftyahei',       # 微软雅黑 - Windows (小写无空格)
@@ -137,7 +272,7 @@ class PygameUI:
                 test_surface = font.render('测', True, (0, 0, 0))
                 if test_surface.get_width() > 10:
                     print(f"使用中文字体: {font_name}")
-                    return font
+                    return ('sysfont', font_name)
             except Exception as e:
                 continue
 
@@ -153,9 +288,9 @@ class PygameUI:
             for font_path in windows_font_paths:
                 if os.path.exists(font_path):
                     try:
-                        font = pygame.font.Font(font_path, size)
+                        pygame.font.Font(font_path, size)
                         print(f"使用字体文件: {font_path}")
-                        return font
+                        return ('file', font_path)
                     except:
                         continue
         except:
@@ -164,21 +299,29 @@ class PygameUI:
         # 如果都失败，使用默认字体（中文可能显示为方框）
         print("警告: 未找到支持中文的字体，界面文字可能显示为方框")
         print("建议: 确保系统已安装微软雅黑或其他中文字体")
-        return pygame.font.Font(None, size)
+        return ('default', None)
 
-    def _test_unicode_support(self):
+    def _render_piece_surfaces(self):
         """
-        测试当前字体是否支持Unicode chess符号
+        预先渲染12种棋子的字形
 
         Returns:
-            bool: 是否支持
+            tuple: 按棋盘编码索引（同ChessBoard.PIECE_CHARS，黑方负编码回绕）的pygame.Surface，空格为None
         """
-        try:
-            test_surface = self.piece_font.render('♔', True, (0, 0, 0))
-            # 如果渲染的宽度太小，说明不支持
-            return test_surface.get_width() > 5
-        except:
-            return False
+        symbols = self.PIECE_SYMBOLS_UNICODE if self.use_unicode else self.PIECE_SYMBOLS_ASCII
+        surfaces = []
+        for piece in self.game_manager.board.PIECE_CHARS:
+            if piece not in symbols:
+                surfaces.append(None)
+                continue
+            if self.use_unicode:
+                # Unicode符号用黑白色区分
+                color = (255, 255, 255) if piece.isupper() else (0, 0, 0)
+            else:
+                # ASCII字符用颜色背景区分
+                color = (255, 200, 100) if piece.isupper() else (100, 50, 20)
+            surfaces.append(self.piece_font.render(symbols[piece], True, color).convert_alpha())
+        return tuple(surfaces)
 
     def run(self, ai_player=None):
         """
@@ -191,24 +334,36 @@ class PygameUI:
         running = True
 
         while running:
-            # 处理事件
-            for event in pygame.event.get():
+            ai_to_move = self._is_ai_turn(ai_player)
+
+            # 处理事件：轮到AI或需要重绘时只取出已有事件；空闲时阻塞等待输入，不再按帧率轮询，
+            # AI思考期间按较短的超时醒来检查搜索结果
+            if ai_to_move or self._dirty:
+                events = pygame.event.get()
+            else:
+                event = pygame.event.wait(self.AI_POLL_MS if self.ai_thinking else self.IDLE_WAIT_MS)
+                events = [] if event.type == pygame.NOEVENT else [event] + pygame.event.get()
+
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN and not self.ai_thinking:
+                elif (event.type == pygame.MOUSEBUTTONDOWN and not self.ai_thinking and
+                      not self._is_ai_turn(ai_player)):
+                    # 轮到AI走棋时（包括搜索线程尚未启动时）忽略点击；
+                    # 每个事件都重新判断，同一批事件中玩家走完一步后的点击也会被忽略
                     self._handle_mouse_click(event.pos)
-
-            # 如果轮到AI移动
-            if (ai_player and
-                not self.game_manager.game_over and
-                self.game_manager.board.current_turn == ai_player.color and
-                not self.ai_thinking):
-                self.ai_thinking = True
-                self._draw()
-                pygame.display.flip()
-
-                # AI计算最佳移动
-                best_move = ai_player.get_best_move()
+                elif event.type == pygame.VIDEOEXPOSE:
+                    self._dirty = True
+
+            # 如果轮到AI移动，在后台线程中开始搜索；界面继续处理事件（包括退出）
+            if self._is_ai_turn(ai_player):
+                self._start_ai_search(ai_player)
+
+            # AI搜索完成后在主线程执行移动
+            elif self.ai_thinking and not self._ai_queue.empty():
+                best_move = self._ai_queue.get()
+                # 搜索用的是棋盘副本，搜索结束后让AI重新指向真实棋盘
+                ai_player.board = self.game_manager.board
                 if best_move:
                     from_pos, to_pos = best_move
                     from_row, from_col = from_pos
@@ -216,17 +371,39 @@ class PygameUI:
                     self.game_manager.make_move(from_row, from_col, to_row, to_col)
 
                 self.ai_thinking = False
+                self._dirty = True
+                self._scene_dirty = True
 
-            # 绘制界面
-            self._draw()
-
-            # 更新显示
-            pygame.display.flip()
-            clock.tick(30)
+            # 只在状态变化后绘制界面并更新显示，重绘频率不超过30帧/秒
+            if self._dirty:
+                self._draw()
+                pygame.display.flip()
+                self._dirty = False
+                clock.tick(30)
 
         pygame.quit()
         sys.exit()
 
+    def _is_ai_turn(self, ai_player):
+        """是否轮到AI走棋且尚未开始搜索"""
+        return bool(ai_player and
+                    not self.game_manager.game_over and
+                    self.game_manager.board.current_turn == ai_player.color and
+                    not self.ai_thinking)
+
+    def _start_ai_search(self, ai_player):
+        """
+        在后台线程中计算AI的最佳移动，结果放入self._ai_queue
+
+        搜索会在棋盘上原地试走，因此让AI在当前局面的副本上搜索，主线程照常绘制真实棋盘；
+        主循环取到结果后把ai_player.board恢复为真实棋盘
+        """
+        self.ai_thinking = True
+        self._dirty = True
+        ai_player.board = self.game_manager.board.copy()
+        thread = threading.Thread(target=lambda: self._ai_queue.put(ai_player.get_best_move()), daemon=True)
+        thread.start()
+
     def _handle_mouse_click(self, pos):
         """处理鼠标点击事件"""
         x, y = pos
@@ -239,6 +416,10 @@ class PygameUI:
         if not (0 <= row < 8 and 0 <= col < 8):
             return
 
+        # 点击棋盘会改变选中状态或执行移动（升变对话框也会覆盖棋盘），需要重绘
+        self._dirty = True
+        self._scene_dirty = True
+
         piece = self.game_manager.board.get_piece(row, col)
 
         # 如果已选中棋子，尝试移动
@@ -263,22 +444,22 @@ class PygameUI:
 
                 if success:
                     self.selected_piece = None
-                    self.legal_moves = []
+                    self.legal_moves = frozenset()
             # 如果点击的是己方其他棋子，重新选择
             elif (piece != self.game_manager.board.EMPTY and
                   self.game_manager.board.get_piece_color(piece) == self.game_manager.board.current_turn):
                 self.selected_piece = (row, col)
-                self.legal_moves = self.game_manager.get_legal_moves_for_piece(row, col)
+                self.legal_moves = frozenset(self.game_manager.get_legal_moves_for_piece(row, col))
             else:
                 # 取消选择
                 self.selected_piece = None
-                self.legal_moves = []
+                self.legal_moves = frozenset()
 
         # 如果未选中棋子，选择当前位置的棋子
         elif (piece != self.game_manager.board.EMPTY and
               self.game_manager.board.get_piece_color(piece) == self.game_manager.board.current_turn):
             self.selected_piece = (row, col)
-            self.legal_moves = self.game_manager.get_legal_moves_for_piece(row, col)
+            self.legal_moves = frozenset(self.game_manager.get_legal_moves_for_piece(row, col))
 
     def _show_promotion_dialog(self, is_white):
         """
@@ -299,10 +480,7 @@ class PygameUI:
         dialog_x = (self.width - dialog_width) // 2
         dialog_y = (self.height - dialog_height) // 2
 
-        overlay = pygame.Surface((self.width, self.height))
-        overlay.set_alpha(180)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._overlay(180), (0, 0))
 
         pygame.draw.rect(self.screen, (255, 255, 255),
                         (dialog_x, dialog_y, dialog_width, dialog_height))
@@ -343,30 +521,39 @@ class PygameUI:
 
         pygame.display.flip()
 
-        # 等待用户选择
+        # 等待用户选择（对话框内容不变，阻塞等待事件，不空转占用CPU）
         while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    x, y = event.pos
-                    for bx, by, bw, bh, piece in buttons:
-                        if bx <= x <= bx + bw and by <= y <= by + bh:
-                            return piece
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                x, y = event.pos
+                for bx, by, bw, bh, piece in buttons:
+                    if bx <= x <= bx + bw and by <= y <= by + bh:
+                        return piece
 
     def _draw(self):
         """绘制整个界面"""
-        self.screen.fill((220, 220, 220))
+        if self._scene_dirty:
+            self.screen.fill((220, 220, 220))
 
-        # 绘制棋盘
-        self._draw_board()
+            # 将军状态每次重绘只计算一次，棋盘高亮和信息面板共用
+            in_check = self.game_manager.is_check()
 
-        # 绘制棋子
-        self._draw_pieces()
+            # 绘制棋盘
+            self._draw_board(in_check)
 
-        # 绘制信息面板
-        self._draw_info_panel()
+            # 绘制棋子
+            self._draw_pieces()
+
+            # 绘制信息面板
+            self._draw_info_panel(in_check)
+
+            self._scene.blit(self.screen, (0, 0))
+            self._scene_dirty = False
+        else:
+            self.screen.blit(self._scene, (0, 0))
 
         # 如果游戏结束，显示结果
         if self.game_manager.game_over:
@@ -376,105 +563,95 @@ class PygameUI:
         if self.ai_thinking:
             self._draw_ai_thinking()
 
-    def _draw_board(self):
-        """绘制棋盘"""
-        for row in range(8):
-            for col in range(8):
-                x = self.board_offset_x + col * self.square_size
-                y = self.board_offset_y + row * self.square_size
+    def _draw_board(self, in_check):
+        """
+        绘制棋盘（方格和坐标标记收集成列表后一次blits）
 
-                # 确定方格颜色
-                color = self.WHITE if (row + col) % 2 == 0 else self.BLACK
+        Args:
+            in_check: 当前回合方是否被将军
+        """
+        # 以不带高亮的棋盘为底，只覆盖少数需要高亮的方格
+        blit_list = self._plain_square_blits.copy()
+        highlight = self._square_surfaces[self.HIGHLIGHT]
+        squares = self._squares
+
+        # 选中的棋子和合法移动目标高亮显示
+        highlighted = set(self.legal_moves)
+        if self.selected_piece is not None:
+            highlighted.add(self.selected_piece)
+        for row, col in highlighted:
+            index = row * 8 + col
+            blit_list[index] = (highlight, squares[index][2:4])
+
+        # 如果王被将军，红色高亮
+        if in_check:
+            board = self.game_manager.board
+            row, col = board.white_king_pos if board.current_turn == 'white' else board.black_king_pos
+            index = row * 8 + col
+            blit_list[index] = (self._square_surfaces[self.CHECK_HIGHLIGHT], squares[index][2:4])
 
-                # 如果是选中的棋子，高亮显示
-                if self.selected_piece == (row, col):
-                    color = self.HIGHLIGHT
+        # 绘制坐标标记
+        blit_list.extend(self._label_blits)
 
-                # 如果是合法移动目标，高亮显示
-                if (row, col) in self.legal_moves:
-                    color = self.HIGHLIGHT
+        self.screen.blits(blit_list, doreturn=0)
 
-                # 如果王被将军，红色高亮
-                if self.game_manager.is_check():
-                    king_pos = (self.game_manager.board.white_king_pos
-                               if self.game_manager.board.current_turn == 'white'
-                               else self.game_manager.board.black_king_pos)
-                    if (row, col) == king_pos:
-                        color = self.CHECK_HIGHLIGHT
+    def _draw_pieces(self):
+        """绘制棋子（直接读取int8棋盘，收集成列表后一次blits）"""
+        piece_surfaces = self._piece_surfaces
+        blit_list = []
+        for (_, _, _, _, center_x, center_y), code in zip(self._squares, self.game_manager.board.squares):
+            if not code:
+                continue
 
-                pygame.draw.rect(self.screen, color,
-                               (x, y, self.square_size, self.square_size))
+            # 绘制预先渲染的棋子
+            text = piece_surfaces[code]
+            blit_list.append((text, text.get_rect(center=(center_x, center_y))))
 
-        # 绘制坐标标记
-        for i in range(8):
-            # 列标记 (a-h)
-            label = self.small_font.render(chr(ord('a') + i), True, self.TEXT_COLOR)
-            x = self.board_offset_x + i * self.square_size + self.square_size // 2
-            y = self.board_offset_y + self.board_size + 5
-            label_rect = label.get_rect(center=(x, y))
-            self.screen.blit(label, label_rect)
+        self.screen.blits(blit_list, doreturn=0)
 
-            # 行标记 (1-8)
-            label = self.small_font.render(str(8 - i), True, self.TEXT_COLOR)
-            x = self.board_offset_x - 15
-            y = self.board_offset_y + i * self.square_size + self.square_size // 2
-            label_rect = label.get_rect(center=(x, y))
-            self.screen.blit(label, label_rect)
+    def _draw_info_panel(self, in_check):
+        """
+        绘制信息面板
 
-    def _draw_pieces(self):
-        """绘制棋子"""
-        for row in range(8):
-            for col in range(8):
-                piece = self.game_manager.board.get_piece(row, col)
-                if piece == self.game_manager.board.EMPTY:
-                    continue
-
-                x = self.board_offset_x + col * self.square_size + self.square_size // 2
-                y = self.board_offset_y + row * self.square_size + self.square_size // 2
-
-                # 根据字体支持选择符号集
-                if self.use_unicode:
-                    symbol = self.PIECE_SYMBOLS_UNICODE.get(piece, piece)
-                else:
-                    symbol = self.PIECE_SYMBOLS_ASCII.get(piece, piece)
-
-                # 棋子颜色
-                is_white = self.game_manager.board.is_white_piece(piece)
-                if self.use_unicode:
-                    # Unicode符号用黑白色区分
-                    color = (255, 255, 255) if is_white else (0, 0, 0)
-                else:
-                    # ASCII字符用颜色背景区分
-                    color = (255, 200, 100) if is_white else (100, 50, 20)
-
-                # 绘制棋子
-                text = self.piece_font.render(symbol, True, color)
-                text_rect = text.get_rect(center=(x, y))
-                self.screen.blit(text, text_rect)
-
-    def _draw_info_panel(self):
-        """绘制信息面板"""
+        Args:
+            in_check: 当前回合方是否被将军
+        """
         # 当前回合
-        turn_text = f"当前回合: {'白方' if self.game_manager.board.current_turn == 'white' else '黑方'}"
-        text = self.info_font.render(turn_text, True, self.TEXT_COLOR)
-        self.screen.blit(text, (20, 10))
+        self.screen.blit(self._turn_surfaces[self.game_manager.board.current_turn], (20, 10))
 
         # 将军状态
-        if self.game_manager.is_check():
-            check_text = self.info_font.render("将军!", True, (255, 0, 0))
-            self.screen.blit(check_text, (self.width - 150, 10))
+        if in_check:
+            self.screen.blit(self._check_surface, (self.width - 150, 10))
 
         # 移动次数
         move_count = len(self.game_manager.board.move_history)
-        count_text = self.small_font.render(f"移动次数: {move_count}", True, self.TEXT_COLOR)
-        self.screen.blit(count_text, (20, self.height - 30))
+        if move_count != self._move_count:
+            self._move_count = move_count
+            self._move_count_surface = self.small_font.render(
+                f"移动次数: {move_count}", True, self.TEXT_COLOR).convert_alpha()
+        self.screen.blit(self._move_count_surface, (20, self.height - 30))
+
+    def _overlay(self, alpha):
+        """
+        获取覆盖整个窗口的半透明黑色遮罩（同一透明度只创建一次）
+
+        Args:
+            alpha: 透明度（0-255）
+
+        Returns:
+            pygame.Surface: 遮罩
+        """
+        overlay = self._overlays.get(alpha)
+        if overlay is None:
+            overlay = pygame.Surface((self.width, self.height)).convert()
+            overlay.fill((0, 0, 0))
+            overlay.set_alpha(alpha)
+            self._overlays[alpha] = overlay
+        return overlay
 
     def _draw_game_over(self):
         """绘制游戏结束界面"""
-        overlay = pygame.Surface((self.width, self.height))
-        overlay.set_alpha(200)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._overlay(200), (0, 0))
 
         # 显示结果
         if self.game_manager.game_result == 'checkmate':
@@ -495,14 +672,5 @@ class PygameUI:
 
     def _draw_ai_thinking(self):
         """绘制AI思考提示"""
-        text = self.info_font.render("AI思考中...", True, (100, 100, 255))
-        text_rect = text.get_rect(center=(self.width // 2, self.height // 2))
-
-        # 半透明背景
-        bg = pygame.Surface((text_rect.width + 40, text_rect.height + 20))
-        bg.set_alpha(200)
-        bg.fill((255, 255, 255))
-        bg_rect = bg.get_rect(center=(self.width // 2, self.height // 2))
-        self.screen.blit(bg, bg_rect)
-
-        self.screen.blit(text, text_rect)
+        # 半透明背景和文字都已预先渲染
+        self.screen.blits(self._ai_thinking_blits, doreturn=0)